@@ -9,28 +9,88 @@ core/explain.py
 - OPENAI_MODEL   : OpenAI 모델명 (기본값: gpt-4o-mini)
 
 주요 함수:
-- explain_spl_markdown_backend(spl, include_raw_query=True) -> str
-- explain_spl_markdown_backend_with_meta(spl, include_raw_query=True) -> dict
+- explain_spl_markdown_backend(spl, include_raw_query=True, on_token=None) -> str
+- explain_spl_markdown_backend_with_meta(spl, include_raw_query=True, on_token=None) -> dict
+  (on_token 콜백을 주면 토큰 스트리밍)
+- get_openai_client() -> OpenAI | None
+- get_async_openai_client() -> AsyncOpenAI | None  (코루틴 안에서 호출)
 """
 
 from __future__ import annotations
+import asyncio
+import atexit
+import hashlib
 import os
+import ssl
+import threading
+import weakref
+from collections import OrderedDict
 from dotenv import load_dotenv
-from typing import Dict, Any, Optional, Tuple
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple
 
 load_dotenv()
 
 # -----------------------------
-# OpenAI 클라이언트
+# OpenAI 클라이언트 (프로세스 전역 공유)
+# - SSL 컨텍스트/커넥션 풀을 한 번만 만들고 모든 호출에서 재사용
 # -----------------------------
+_SHARED_SSL: Optional[ssl.SSLContext] = None
+_HTTPX = None
 _OPENAI = None
+# Responses API 를 쓸 수 없을 때만 Chat Completions 로 재시도 (SDK 에 responses 가 없거나 엔드포인트가 없는 경우)
+# 재시도 여부는 스트리밍이 시작되기 전(요청 생성 시점)에만 판단해 이미 보낸 토큰이 두 번 나가지 않게 함
+# 429/연결/타임아웃 등 나머지 API 오류는 같은 프롬프트를 다시 보내지 않고 바로 오류로 반환
+_FALLBACK_ERRORS: Tuple[type, ...] = ()
+_API_ERRORS: Tuple[type, ...] = ()
 try:
     if os.getenv("OPENAI_API_KEY"):
+        import httpx
+        import openai
         from openai import OpenAI  # pip install openai>=1.0.0
-        _OPENAI = OpenAI()
+        _FALLBACK_ERRORS = (openai.NotFoundError,)
+        _API_ERRORS = (openai.OpenAIError,)
+        _SHARED_SSL = ssl.create_default_context()
+        _HTTPX = httpx.Client(
+            verify=_SHARED_SSL,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+            timeout=60.0,
+        )
+        _OPENAI = OpenAI(http_client=_HTTPX)
+        atexit.register(_HTTPX.close)
 except Exception:
     _OPENAI = None
 
+_OPENAI_READY = _OPENAI is not None
+
+def get_openai_client():
+    """공유 OpenAI 클라이언트 반환 (OPENAI_API_KEY 미설정 시 None)"""
+    return _OPENAI
+
+# httpx.AsyncClient 의 커넥션 풀은 생성된 이벤트 루프에 묶이므로 루프마다 하나씩 두고,
+# 비용이 큰 SSL 컨텍스트는 동기 클라이언트와 공유한다.
+_ASYNC_OPENAI: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_ASYNC_LOCK = threading.Lock()
+
+def get_async_openai_client():
+    """현재 실행 중인 이벤트 루프용 AsyncOpenAI 클라이언트 (코루틴 안에서 호출, 키 미설정 시 None)"""
+    if not _OPENAI_READY:
+        return None
+    loop = asyncio.get_running_loop()
+    with _ASYNC_LOCK:
+        client = _ASYNC_OPENAI.get(loop)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                http_client=httpx.AsyncClient(
+                    verify=_SHARED_SSL,
+                    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                    timeout=60.0,
+                )
+            )
+            _ASYNC_OPENAI[loop] = client
+    return client
+
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 # -----------------------------
@@ -59,40 +119,113 @@ _LLM_TEMPLATE = (
     "### 쿼리 검증\n- <검증>\n"
 )
 
+# 치환 지점이 {spl} 하나뿐이므로 import 시 앞/뒤로 나눠 두고 이어붙이기만 한다
+_LLM_PRE, _LLM_POST = _LLM_TEMPLATE.split("{spl}")
+
 # -----------------------------
 # LLM 호출
 # -----------------------------
 def is_llm_ready() -> bool:
-    return _OPENAI is not None
+    return _OPENAI_READY
 
-def llm_explain_and_validate(spl: str) -> Tuple[Optional[str], Optional[str]]:
+def _responses_deltas(stream) -> Iterable[str]:
+    for event in stream:
+        if getattr(event, "type", None) == "response.output_text.delta":
+            yield event.delta
+
+def _chat_deltas(stream) -> Iterable[str]:
+    for chunk in stream:
+        if chunk.choices:
+            yield chunk.choices[0].delta.content
+
+def _collect_stream(pieces: Iterable[Optional[str]], on_token: Callable[[str], None]) -> str:
+    """스트림 조각을 콜백으로 흘려보내면서 누적"""
+    buf = []
+    for piece in pieces:
+        if piece:
+            buf.append(piece)
+            on_token(piece)
+    return "".join(buf)
+
+# 동일 SPL 재설명 방지용 LRU (성공한 결과만 저장)
+_EXPLAIN_CACHE_MAX = 256
+_EXPLAIN_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_EXPLAIN_CACHE_LOCK = threading.Lock()
+
+def _explain_cache_key(spl: str) -> Tuple[str, str]:
+    return hashlib.blake2b(spl.encode("utf-8"), digest_size=16).hexdigest(), OPENAI_MODEL
+
+def llm_explain_and_validate(
+    spl: str,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """on_token 이 주어지면 stream=True 로 호출하고 토큰 조각마다 콜백"""
     if _OPENAI is None:
         return None, "OPENAI_API_KEY not set"
 
-    prompt = _LLM_TEMPLATE.format(spl=spl)
-    try:
-        rsp = _OPENAI.responses.create(
-            model=OPENAI_MODEL,
-            input=prompt,
-            system=_LLM_SYSTEM,
-            temperature=0.2,
-        )
-        if hasattr(rsp, "output_text") and rsp.output_text:
-            return rsp.output_text.strip(), None
-    except Exception as e:
+    key = _explain_cache_key(spl)
+    with _EXPLAIN_CACHE_LOCK:
+        cached = _EXPLAIN_CACHE.get(key)
+        if cached is not None:
+            _EXPLAIN_CACHE.move_to_end(key)
+            return cached, None
+
+    out, err = _call_llm(spl, on_token)
+    if out:
+        with _EXPLAIN_CACHE_LOCK:
+            _EXPLAIN_CACHE[key] = out
+            if len(_EXPLAIN_CACHE) > _EXPLAIN_CACHE_MAX:
+                _EXPLAIN_CACHE.popitem(last=False)
+    return out, err
+
+def _call_llm(
+    spl: str,
+    on_token: Optional[Callable[[str], None]] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    prompt = _LLM_PRE + spl + _LLM_POST
+    stream = on_token is not None
+    rsp = None
+    if hasattr(_OPENAI, "responses"):
         try:
-            chat = _OPENAI.chat.completions.create(
+            rsp = _OPENAI.responses.create(
                 model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": _LLM_SYSTEM},
-                    {"role": "user", "content": prompt},
-                ],
+                instructions=_LLM_SYSTEM,
+                input=prompt,
                 temperature=0.2,
+                stream=stream,
             )
-            return chat.choices[0].message.content.strip(), None
-        except Exception as e2:
-            return None, str(e2)
-    return None, "Unknown response format"
+        except _FALLBACK_ERRORS:
+            rsp = None
+        except _API_ERRORS as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    if rsp is not None:
+        try:
+            if stream:
+                out = _collect_stream(_responses_deltas(rsp), on_token)
+            else:
+                out = getattr(rsp, "output_text", None)
+        except _API_ERRORS as e:
+            return None, f"{type(e).__name__}: {e}"
+        if out:
+            return out.strip(), None
+        return None, "Unknown response format"
+
+    try:
+        chat = _OPENAI.chat.completions.create(
+            model=OPENAI_MODEL,
+            messages=[
+                {"role": "system", "content": _LLM_SYSTEM},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.2,
+            stream=stream,
+        )
+        if stream:
+            return _collect_stream(_chat_deltas(chat), on_token).strip(), None
+        return chat.choices[0].message.content.strip(), None
+    except Exception as e2:
+        return None, str(e2)
 
 # -----------------------------
 # 퍼사드 함수
@@ -104,9 +237,10 @@ def _prepend_raw_query(spl: str, body: str, model: str, err: Optional[str]=None)
 
 def explain_spl_markdown_backend_with_meta(
     spl: str,
-    include_raw_query: bool = True
+    include_raw_query: bool = True,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> Dict[str, Any]:
-    out, error = llm_explain_and_validate(spl)
+    out, error = llm_explain_and_validate(spl, on_token=on_token)
     if not out:
         raise RuntimeError(f"LLM failed: {error}")
 
@@ -123,13 +257,16 @@ def explain_spl_markdown_backend_with_meta(
 
 def explain_spl_markdown_backend(
     spl: str,
-    include_raw_query: bool = True
+    include_raw_query: bool = True,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> str:
     return explain_spl_markdown_backend_with_meta(
-        spl, include_raw_query=include_raw_query
+        spl, include_raw_query=include_raw_query, on_token=on_token
     )["markdown"]
 
 __all__ = [
+    "get_openai_client",
+    "get_async_openai_client",
     "is_llm_ready",
     "llm_explain_and_validate",
     "explain_spl_markdown_backend",
@@ -6,49 +6,116 @@ core/explain.py (백엔드 전용)
 환경변수:
 - OPENAI_API_KEY : OpenAI 키
 - OPENAI_MODEL   : OpenAI 모델명 (기본 gpt-4o-mini)
+- OPENAI_MAX_RETRIES : 일시적 오류(429/5xx/연결) 재시도 횟수 (기본 5)
+- OPENAI_MAX_OUTPUT_TOKENS : 모델 최대 출력 토큰 (묶음 설명 크기 계산용, 기본은 모델명으로 추정)
+- REDIS_URL      : 설정 시 워커 간 공유 설명 캐시로 사용 (선택, redis 패키지 필요)
+- LLM_CACHE_TTL  : Redis 캐시 만료 시간(초, 기본 86400)
 
 주요 함수:
 - explain_spl_markdown_backend(spl, include_raw_query=True) -> str
 - explain_spl_markdown_backend_with_meta(spl, include_raw_query=True) -> dict
+- aexplain_spl_markdown_backend(spl, include_raw_query=True) -> str   (비동기)
+- aexplain_spl_markdown_backend_with_meta(spl, include_raw_query=True) -> dict   (비동기)
+- aexplain_many(spls, concurrency=20, include_raw_query=True) -> list[dict]   (비동기, 동시 실행 수 제한)
+- explain_spl_batch(spls, include_raw_query=True) -> list[str]   (여러 SPL 을 한 번의 호출로)
+- llm_explain_and_validate_stream(spl) -> Iterator[str]   (토큰 스트리밍)
+- explain_spl_markdown_backend_stream(spl, include_raw_query=True) -> Iterator[str]   (Markdown 스트리밍)
+- explain_spl_markdown_batch(spls, include_raw_query=True) -> list[dict]   (Batch API, 최대 24시간)
 """
 
 from __future__ import annotations
-import os, re
+import asyncio, atexit, hashlib, importlib.util, json, os, re, sys, threading, time, weakref
+from collections import OrderedDict
 from dotenv import load_dotenv
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Tuple, Optional
+from typing import Iterator, List, Dict, Any, Tuple, Optional
 
 load_dotenv()
 
 # -----------------------------
 # OpenAI 클라이언트
+# - 커넥션 풀을 공유해 호출/재시도마다 TCP+TLS 연결을 새로 맺지 않음
+# - h2 패키지가 설치되어 있으면 HTTP/2 로 동시 요청을 한 연결에 다중화
 # -----------------------------
+_HTTP2 = importlib.util.find_spec("h2") is not None
+# 429/5xx/연결 오류는 SDK 가 지수 백오프 + 지터로 재시도 (Retry-After 헤더가 있으면 그 값을 따름)
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+
+# 파서만 쓰는 경우 httpx/openai 를 import 하지 않도록 첫 LLM 호출 때 생성
 _OPENAI = None
-try:
-    if os.getenv("OPENAI_API_KEY"):
-        from openai import OpenAI  # pip install openai>=1.0.0
-        _OPENAI = OpenAI()
-except Exception:
-    _OPENAI = None
+_OPENAI_INITIALIZED = False
+_OPENAI_LOCK = threading.Lock()
+
+def _get_client():
+    """공유 OpenAI 클라이언트 (OPENAI_API_KEY 미설정이거나 생성 실패 시 None)"""
+    global _OPENAI, _OPENAI_INITIALIZED
+    if _OPENAI_INITIALIZED:
+        return _OPENAI
+    with _OPENAI_LOCK:
+        if not _OPENAI_INITIALIZED:
+            try:
+                if os.getenv("OPENAI_API_KEY"):
+                    import httpx
+                    from openai import OpenAI  # pip install openai>=1.0.0
+                    http_client = httpx.Client(
+                        http2=_HTTP2,
+                        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                        timeout=httpx.Timeout(60.0, connect=5.0),
+                    )
+                    _OPENAI = OpenAI(http_client=http_client, max_retries=OPENAI_MAX_RETRIES)
+                    atexit.register(http_client.close)
+            except Exception:
+                _OPENAI = None
+            _OPENAI_INITIALIZED = True
+    return _OPENAI
+
+# AsyncOpenAI 는 커넥션 풀이 이벤트 루프에 묶이므로 루프마다 하나씩 생성
+_ASYNC_OPENAI: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_ASYNC_LOCK = threading.Lock()
+
+def _get_async_client():
+    """현재 이벤트 루프용 AsyncOpenAI 클라이언트 (코루틴 안에서 호출)"""
+    loop = asyncio.get_running_loop()
+    with _ASYNC_LOCK:
+        client = _ASYNC_OPENAI.get(loop)
+        if client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            client = AsyncOpenAI(
+                max_retries=OPENAI_MAX_RETRIES,
+                http_client=httpx.AsyncClient(
+                    http2=_HTTP2,
+                    limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                    timeout=httpx.Timeout(60.0, connect=5.0),
+                )
+            )
+            _ASYNC_OPENAI[loop] = client
+    return client
 
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
 
 # -----------------------------
 # SPL 파서 (단순 파싱만 유지)
 # -----------------------------
-RE_INDEX = re.compile(r"\bindex\s*=\s*([\w:-]+)")
-RE_SOURCETYPE = re.compile(r"\bsourcetype\s*=\s*\"?([\w:.-]+)\"?")
-RE_EARLIEST = re.compile(r"\bearliest\s*=\s*([\w@:.+-]+)")
-RE_LATEST = re.compile(r"\blatest\s*=\s*([\w@:.+-]+)")
+# index / sourcetype / earliest / latest 를 한 번의 스캔으로 찾기 위해 하나의 교대로 합침 (m.lastgroup 으로 구분)
+RE_OVERVIEW = re.compile(
+    r"\b(?:index\s*=\s*(?P<index>[\w:-]+)"
+    r"|sourcetype\s*=\s*\"?(?P<sourcetype>[\w:.-]+)\"?"
+    r"|earliest\s*=\s*(?P<earliest>[\w@:.+-]+)"
+    r"|latest\s*=\s*(?P<latest>[\w@:.+-]+))"
+)
 RE_JOIN = re.compile(r"\|\s*join\s+(.+?)\[(.+?)\]", re.I | re.S)
 
-@dataclass
+# 파싱할 때마다 만들어지는 객체라 __dict__ 없이 슬롯으로 (slots 인자는 3.10+)
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_DATACLASS_SLOTS)
 class SplOverview:
     index: List[str] = field(default_factory=list)
     sourcetype: List[str] = field(default_factory=list)
     time_window: Dict[str, str] = field(default_factory=dict)
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SplOps:
     joins: List[Dict[str, str]] = field(default_factory=list)
     others: List[str] = field(default_factory=list)
@@ -59,12 +126,14 @@ def parse_spl(spl: str) -> Dict[str, Any]:
     ov = SplOverview()
     ops = SplOps()
 
-    ov.index = RE_INDEX.findall(text)
-    ov.sourcetype = RE_SOURCETYPE.findall(text)
-    e = RE_EARLIEST.search(text)
-    l = RE_LATEST.search(text)
-    if e: ov.time_window["earliest"] = e.group(1)
-    if l: ov.time_window["latest"] = l.group(1)
+    for m in RE_OVERVIEW.finditer(text):
+        key = m.lastgroup
+        if key == "index":
+            ov.index.append(m.group(key))
+        elif key == "sourcetype":
+            ov.sourcetype.append(m.group(key))
+        elif key not in ov.time_window:  # earliest/latest 는 처음 나온 값만 사용
+            ov.time_window[key] = m.group(key)
 
     for m in RE_JOIN.finditer(text):
         ops.joins.append({"on": m.group(1).strip(), "subsearch": m.group(2).strip()})
@@ -97,61 +166,485 @@ _LLM_TEMPLATE = (
     "### 검증 결과\n- ...\n"
 )
 
+# 호출마다 format 파싱을 하지 않도록 {spl} 앞뒤를 미리 잘라 두고 이어 붙이기만 함
+_LLM_PRE, _LLM_POST = _LLM_TEMPLATE.split("{spl}")
+
+# 프롬프트에 넣기 전 SPL 정규화 (구조에 영향 없는 부분을 덜어 입력 토큰 절감, 캐시 키도 이 형태로)
+_SPL_PROMPT_MAX_CHARS = 8000
+RE_MD_FENCE = re.compile(r"\A```[\w-]*[ \t]*\n(.*)\n```\Z", re.S)  # 마크다운 코드블록째 붙여넣은 경우
+# 따옴표 문자열("값", '필드명')은 그대로 두고, 그 밖의 SPL 주석(```...```)과 공백 덩어리만 골라냄
+RE_SPL_NOISE = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|(?:\s|```.*?```)+', re.S)
+
+def _canonicalize_spl(spl: str) -> str:
+    text = spl.strip()
+    m = RE_MD_FENCE.match(text)
+    if m:
+        text = m.group(1)
+    return RE_SPL_NOISE.sub(lambda m: m.group(0) if m.group(0)[0] in "\"'" else " ", text).strip()
+
+# 너무 긴 SPL 은 프롬프트에서만 앞부분으로 자름 (캐시 키는 자르기 전 전체로 만들어 뒷부분만 다른 SPL 끼리 섞이지 않게)
+def _prompt_spl(text: str) -> str:
+    if len(text) > _SPL_PROMPT_MAX_CHARS:
+        return text[:_SPL_PROMPT_MAX_CHARS] + " ...(이하 생략)"
+    return text
+
+def _is_truncated(spl: str) -> bool:
+    return len(_canonicalize_spl(spl)) > _SPL_PROMPT_MAX_CHARS
+
+_TRUNCATED_NOTE = (
+    f"> ⚠️ 입력된 SPL 이 {_SPL_PROMPT_MAX_CHARS}자를 넘어 앞부분만 분석했습니다. "
+    "잘린 뒷부분은 아래 설명/검증에 반영되지 않았습니다.\n\n"
+)
+
+def _spl_prompt(spl: str) -> str:
+    return _LLM_PRE + _prompt_spl(_canonicalize_spl(spl)) + _LLM_POST
+
+# 여러 SPL 을 한 번에 설명할 때: 입력은 --- SPL i --- 블록, 출력은 --- EXPLAIN i --- 블록으로 구분
+_LLM_FORMAT = _LLM_POST.split("요구 출력 형식:\n", 1)[1]
+_LLM_BATCH_HEAD = (
+    "다음은 SPL {n}개입니다. 각 SPL마다 아래 형식의 설명을 작성하고, "
+    "각 설명 바로 앞에 `--- EXPLAIN 번호 ---` 한 줄을 붙여 입력 순서대로 출력하세요.\n\n"
+)
+_LLM_BATCH_TAIL = "각 설명의 요구 출력 형식:\n" + _LLM_FORMAT
+_LLM_BATCH_TEMPLATE = _LLM_BATCH_HEAD + _LLM_BATCH_TAIL  # 묶음 설명의 캐시 키용
+RE_BATCH_EXPLAIN = re.compile(r"^-{3}\s*EXPLAIN\s+(\d+)\s*-{3}[ \t]*$", re.M)
+
 # -----------------------------
 # LLM 호출
 # -----------------------------
 def is_llm_ready() -> bool:
-    return _OPENAI is not None
+    # 클라이언트를 만들지 않고 확인 (LOCAL/파서 전용 경로에서 openai/httpx import 와 커넥션 풀 생성을 피함)
+    if _OPENAI_INITIALIZED:
+        return _OPENAI is not None
+    return bool(os.getenv("OPENAI_API_KEY"))
+
+# 동일 SPL 재설명 방지용 LRU (성공한 결과만 저장)
+# 키에 모델, 시스템 프롬프트, 템플릿을 함께 넣어 하나라도 바뀌면 이전 결과를 쓰지 않음
+_EXPLAIN_CACHE_MAX = 1024
+_EXPLAIN_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_EXPLAIN_CACHE_LOCK = threading.Lock()
+
+def _explain_cache_key(spl: str, template: str = _LLM_TEMPLATE) -> str:
+    # 키에는 프롬프트를 결정하는 값(모델, 시스템 프롬프트, 사용자 템플릿, 정규화된 SPL)이 모두 들어가야 한다.
+    # 묶음 요청으로 받은 설명은 _LLM_BATCH_TEMPLATE 으로 따로 저장된다.
+    # 이전 대화/세션 맥락을 프롬프트에 넣게 되면 그 맥락도 함께 키에 포함할 것.
+    spl = _canonicalize_spl(spl)
+    return hashlib.sha256(f"{OPENAI_MODEL}\0{_LLM_SYSTEM}\0{template}\0{spl}".encode("utf-8")).hexdigest()
+
+def cache_clear() -> None:
+    """프로세스 내 설명 캐시 비우기 (Redis 항목은 TTL 로 만료)"""
+    with _EXPLAIN_CACHE_LOCK:
+        _EXPLAIN_CACHE.clear()
+
+# 여러 워커가 설명을 공유하도록 REDIS_URL 이 설정되어 있으면 Redis 를 2차 캐시로 사용
+# (redis 패키지가 없거나 서버에 연결할 수 없으면 프로세스 내 LRU 만 사용)
+_REDIS = None
+_REDIS_ERRORS: Tuple[type, ...] = ()
+_REDIS_PREFIX = "spl_explain:"
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+try:
+    if os.getenv("REDIS_URL"):
+        import redis  # pip install redis (선택)
+        _REDIS = redis.Redis.from_url(
+            os.environ["REDIS_URL"], decode_responses=True,
+            socket_timeout=0.5, socket_connect_timeout=0.5,
+        )
+        _REDIS_ERRORS = (redis.RedisError,)
+except Exception:
+    _REDIS = None
+
+def _cache_get_local(key: str) -> Optional[str]:
+    with _EXPLAIN_CACHE_LOCK:
+        cached = _EXPLAIN_CACHE.get(key)
+        if cached is not None:
+            _EXPLAIN_CACHE.move_to_end(key)
+        return cached
+
+def _cache_put_local(key: str, out: str) -> None:
+    with _EXPLAIN_CACHE_LOCK:
+        _EXPLAIN_CACHE[key] = out
+        _EXPLAIN_CACHE.move_to_end(key)
+        if len(_EXPLAIN_CACHE) > _EXPLAIN_CACHE_MAX:
+            _EXPLAIN_CACHE.popitem(last=False)
+
+def _redis_get(key: str) -> Optional[str]:
+    try:
+        return _REDIS.get(_REDIS_PREFIX + key)
+    except _REDIS_ERRORS:
+        return None
+
+def _redis_put(key: str, out: str) -> None:
+    try:
+        _REDIS.set(_REDIS_PREFIX + key, out, ex=LLM_CACHE_TTL)
+    except _REDIS_ERRORS:
+        pass
+
+def _cache_get(key: str) -> Optional[str]:
+    cached = _cache_get_local(key)
+    if cached is None and _REDIS is not None:
+        cached = _redis_get(key)
+        if cached is not None:
+            _cache_put_local(key, cached)
+    return cached
+
+def _cache_put(key: str, out: str) -> None:
+    _cache_put_local(key, out)
+    if _REDIS is not None:
+        _redis_put(key, out)
+
+# 비동기 경로용: Redis 클라이언트는 블로킹이므로 왕복은 스레드에서 실행해 이벤트 루프를 막지 않음
+async def _acache_get(key: str) -> Optional[str]:
+    cached = _cache_get_local(key)
+    if cached is None and _REDIS is not None:
+        cached = await asyncio.to_thread(_redis_get, key)
+        if cached is not None:
+            _cache_put_local(key, cached)
+    return cached
+
+async def _acache_put(key: str, out: str) -> None:
+    _cache_put_local(key, out)
+    if _REDIS is not None:
+        await asyncio.to_thread(_redis_put, key, out)
 
 def llm_explain_and_validate(spl: str) -> Tuple[Optional[str], Optional[str]]:
-    if _OPENAI is None:
+    if _get_client() is None:
         return None, "OPENAI_API_KEY not set"
 
-    prompt = _LLM_TEMPLATE.format(spl=spl)
+    key = _explain_cache_key(spl)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached, None
+
+    out, err = _call_llm(_spl_prompt(spl))
+    if out:
+        _cache_put(key, out)
+    return out, err
+
+def llm_explain_and_validate_stream(spl: str) -> Iterator[str]:
+    """
+    설명을 생성되는 대로 조각(str) 단위로 yield (첫 토큰까지의 대기 시간 단축용).
+    캐시에 있으면 전체를 한 번에 yield 하고, 끝까지 받은 결과는 캐시에 저장한다.
+    API 오류는 그대로 전달된다.
+    """
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY not set")
+
+    key = _explain_cache_key(spl)
+    cached = _cache_get(key)
+    if cached is not None:
+        yield cached
+        return
+
+    stream = client.chat.completions.create(**_chat_body(_spl_prompt(spl)), stream=True)
+    buf = []
+    for chunk in stream:
+        piece = chunk.choices[0].delta.content if chunk.choices else None
+        if piece:
+            buf.append(piece)
+            yield piece
+    out = "".join(buf).strip()
+    if out:
+        _cache_put(key, out)
+
+# 한 호출에 묶는 SPL 수와 항목당 출력 토큰 예산 (max_tokens = 항목 수 x 예산, 모델 출력 한도 안쪽)
+_BATCH_MAX_ITEMS = 8
+_BATCH_TOKENS_PER_ITEM = 1500
+
+# 모델별 최대 출력 토큰 (앞부분 일치, 더 구체적인 이름을 먼저). 목록에 없으면 보수적으로 4096
+_MODEL_OUTPUT_LIMITS = (
+    ("gpt-4o", 16384), ("gpt-4.1", 32768), ("gpt-4-turbo", 4096), ("gpt-4", 8192), ("gpt-3.5-turbo", 4096),
+)
+
+def _max_output_tokens() -> int:
+    if os.getenv("OPENAI_MAX_OUTPUT_TOKENS"):
+        return int(os.environ["OPENAI_MAX_OUTPUT_TOKENS"])
+    for prefix, limit in _MODEL_OUTPUT_LIMITS:
+        if OPENAI_MODEL.startswith(prefix):
+            return limit
+    return 4096
+
+def _batch_size() -> int:
+    return max(1, min(_BATCH_MAX_ITEMS, _max_output_tokens() // _BATCH_TOKENS_PER_ITEM))
+
+def llm_explain_and_validate_batch(spls: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    여러 SPL 을 한 번의 LLM 호출로 설명 (캐시에 없는 SPL 만 최대 _BATCH_MAX_ITEMS 개씩 묶어서 요청).
+    응답에서 빠지거나 출력 한도에 걸려 잘린 항목은 llm_explain_and_validate 로 하나씩 다시 요청한다.
+    """
+    if _get_client() is None:
+        return [(None, "OPENAI_API_KEY not set")] * len(spls)
+
+    results: List[Tuple[Optional[str], Optional[str]]] = [(None, None)] * len(spls)
+    pending: Dict[str, List[int]] = {}  # 같은 SPL 이 여러 번 있어도 한 번만 요청
+    for i, spl in enumerate(spls):
+        cached = _cache_get(_explain_cache_key(spl))
+        if cached is None:
+            cached = _cache_get(_explain_cache_key(spl, _LLM_BATCH_TEMPLATE))
+        if cached is not None:
+            results[i] = (cached, None)
+        else:
+            pending.setdefault(spl, []).append(i)
+
+    items = list(pending.items())
+    size = _batch_size()
+    for start in range(0, len(items), size):
+        chunk = items[start:start + size]
+        for (spl, idxs), res in zip(chunk, _explain_batch_chunk([spl for spl, _ in chunk])):
+            for i in idxs:
+                results[i] = res
+    return results
+
+def _explain_batch_chunk(spls: List[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    if len(spls) == 1:
+        return [llm_explain_and_validate(spls[0])]
+
+    blocks = "".join(
+        f"--- SPL {n} ---\n{_prompt_spl(_canonicalize_spl(spl))}\n--- END {n} ---\n\n" for n, spl in enumerate(spls, 1)
+    )
+    prompt = _LLM_BATCH_HEAD.format(n=len(spls)) + blocks + _LLM_BATCH_TAIL
+    parsed: Dict[int, str] = {}
     try:
-        rsp = _OPENAI.responses.create(
-            model=OPENAI_MODEL,
-            input=prompt,
-            system=_LLM_SYSTEM,
-            temperature=0.2,
+        chat = _get_client().chat.completions.create(
+            **_chat_body(prompt), max_tokens=_BATCH_TOKENS_PER_ITEM * len(spls)
         )
-        out = getattr(rsp, "output_text", None)
+    except Exception as e:
+        # 일시적 오류는 SDK 가 이미 재시도했으므로, 연결/타임아웃이나 묶음 요청 자체의 문제(400)가 아니면
+        # (인증, 한도 초과 등) 단건으로 다시 보내도 똑같이 실패 -> 모든 항목에 같은 오류를 돌려줌
+        if not _retry_items_alone(e):
+            return [(None, f"{type(e).__name__}: {e}")] * len(spls)
+    else:
+        choice = chat.choices[0]
+        parts = RE_BATCH_EXPLAIN.split((choice.message.content or "").strip())
+        for num, body in zip(parts[1::2], parts[2::2]):
+            if body.strip():
+                parsed.setdefault(int(num), body.strip())
+        # 출력 한도에 걸려 끊겼으면 마지막 블록은 미완성이므로 캐시하지 않고 단건으로 다시 요청
+        if choice.finish_reason == "length" and len(parts) > 1:
+            parsed.pop(int(parts[-2]), None)
+
+    results: List[Tuple[Optional[str], Optional[str]]] = []
+    for n, spl in enumerate(spls, 1):
+        body = parsed.get(n)
+        if body is not None:
+            _cache_put(_explain_cache_key(spl, _LLM_BATCH_TEMPLATE), body)
+            results.append((body, None))
+        else:
+            results.append(llm_explain_and_validate(spl))
+    return results
+
+def _retry_items_alone(e: Exception) -> bool:
+    import openai
+    return isinstance(e, (openai.APIConnectionError, openai.BadRequestError))  # APITimeoutError 포함
+
+async def allm_explain_and_validate(spl: str) -> Tuple[Optional[str], Optional[str]]:
+    """llm_explain_and_validate 의 비동기 버전 (asyncio.gather 로 여러 SPL 을 동시에 설명 가능)"""
+    if _get_client() is None:
+        return None, "OPENAI_API_KEY not set"
+
+    key = _explain_cache_key(spl)
+    cached = await _acache_get(key)
+    if cached is not None:
+        return cached, None
+
+    prompt = _spl_prompt(spl)
+    try:
+        chat = await _get_async_client().chat.completions.create(**_chat_body(prompt))
+        out = chat.choices[0].message.content.strip()
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+    if out:
+        await _acache_put(key, out)
+    return out, None
+
+def _chat_body(prompt: str) -> Dict[str, Any]:
+    """chat.completions.create 인자 (Batch API 요청 body 로도 그대로 사용)"""
+    return {
+        "model": OPENAI_MODEL,
+        "messages": [
+            {"role": "system", "content": _LLM_SYSTEM},
+            {"role": "user", "content": prompt},
+        ],
+        "temperature": 0.2,
+    }
+
+def _call_llm(prompt: str) -> Tuple[Optional[str], Optional[str]]:
+    try:
+        chat = _get_client().chat.completions.create(**_chat_body(prompt))
+        return chat.choices[0].message.content.strip(), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+# -----------------------------
+# Batch API (야간 룰 점검 등 즉시 결과가 필요 없는 대량 설명용, 비용 50% 절감)
+# -----------------------------
+def submit_explain_batch(spls: List[str]) -> str:
+    """SPL 목록을 Batch API 로 제출하고 배치 ID 반환 (custom_id 는 입력 순서 번호)"""
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY not set")
+    lines = [
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _chat_body(_spl_prompt(spl)),
+        }, ensure_ascii=False)
+        for i, spl in enumerate(spls)
+    ]
+    batch_file = client.files.create(
+        file=("explain.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch",
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    return batch.id
+
+def poll_explain_batch(
+    batch_id: str,
+    spls: List[str],
+    include_raw_query: bool = True
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    배치 결과를 explain_spl_markdown_backend_with_meta 와 같은 형태로 입력 순서대로 반환.
+    아직 진행 중이면 None, 배치 자체가 실패하면 RuntimeError. 성공한 설명은 캐시에도 저장.
+    """
+    client = _get_client()
+    if client is None:
+        raise RuntimeError("OPENAI_API_KEY not set")
+    batch = client.batches.retrieve(batch_id)
+    if batch.status in ("failed", "expired", "cancelled"):
+        raise RuntimeError(f"batch {batch_id} {batch.status}")
+    if batch.status != "completed":
+        return None
+
+    outs: Dict[int, str] = {}
+    errors: Dict[int, str] = {}
+    if batch.output_file_id:
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                i = int(item["custom_id"])
+                response = item.get("response") or {}
+                if item.get("error") or response.get("status_code") != 200:
+                    errors[i] = str(item.get("error") or response.get("status_code"))
+                    continue
+                outs[i] = response["body"]["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+
+    metas = []
+    for i, spl in enumerate(spls):
+        out = outs.get(i)
         if out:
-            return out.strip(), None
-    except Exception as e1:
-        try:
-            chat = _OPENAI.chat.completions.create(
-                model=OPENAI_MODEL,
-                messages=[
-                    {"role": "system", "content": _LLM_SYSTEM},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
-            )
-            return chat.choices[0].message.content.strip(), None
-        except Exception as e2:
-            return None, str(e2)
+            _cache_put(_explain_cache_key(spl), out)
+        metas.append(_build_meta(spl, out, None if out else errors.get(i, "missing from batch output"), include_raw_query))
+    return metas
 
-    return None, "Unknown response format"
+def explain_spl_markdown_batch(
+    spls: List[str],
+    include_raw_query: bool = True,
+    poll_interval: float = 60.0
+) -> List[Dict[str, Any]]:
+    """submit_explain_batch + poll_explain_batch 를 끝날 때까지 기다리는 편의 함수 (최대 24시간 걸릴 수 있음)"""
+    batch_id = submit_explain_batch(spls)
+    while True:
+        metas = poll_explain_batch(batch_id, spls, include_raw_query=include_raw_query)
+        if metas is not None:
+            return metas
+        time.sleep(poll_interval)
 
 # -----------------------------
 # 퍼사드
 # -----------------------------
 def _prepend_raw_query(
-    spl: str, body: str, engine: str, model: str, llm_error: Optional[str] = None
+    spl: str, body: str, engine: str, model: Optional[str], llm_error: Optional[str] = None
 ) -> str:
-    head = f"<!-- engine={engine}; model={model}{'; error='+llm_error if llm_error else ''} -->\n"
+    head = f"<!-- engine={engine}; model={model or '-'}{'; error='+llm_error if llm_error else ''} -->\n"
     raw = f"### 입력된 쿼리\n```spl\n{spl}\n```\n\n"
     return head + raw + body
 
-def explain_spl_markdown_backend_with_meta(
-    spl: str,
-    include_raw_query: bool = True
+# -----------------------------
+# 로컬 설명 (파이프/매크로가 없는 단순 검색은 LLM 없이 parse_spl 결과로 고정 Markdown 생성)
+# -----------------------------
+RE_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'')
+# 따옴표 구간을 한 덩어리로 보는 검색어 토큰 (공백으로만 나눔)
+RE_SEARCH_TERM = re.compile(r'(?:"(?:[^"\\]|\\.)*"|\'(?:[^\'\\]|\\.)*\'|[^\s"\']+|["\'])+')
+
+def _wrapped_in_parens(text: str) -> bool:
+    """맨 앞 ( 와 맨 뒤 ) 가 서로 짝인지 (전체를 감싸는 괄호 한 쌍인지)"""
+    unquoted = RE_QUOTED.sub('""', text)
+    if not (unquoted.startswith("(") and unquoted.endswith(")")):
+        return False
+    depth = 0
+    for i, ch in enumerate(unquoted):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i == len(unquoted) - 1
+    return False
+
+def _local_explain(spl: str) -> Optional[str]:
+    """파이프/서브서치/매크로가 없는 검색이면 설명 Markdown, 아니면 None"""
+    text = _canonicalize_spl(spl)
+    unquoted = RE_QUOTED.sub('""', text)
+    # `매크로` 는 펼치면 파이프 연산이 들어 있을 수 있으므로 LLM 으로 보냄 (주석은 정규화에서 이미 제거됨)
+    if not text or "|" in unquoted or "[" in unquoted or "`" in unquoted:
+        return None
+    # parse_spl 은 따옴표 안 공백을 다루지 못하므로 (sourcetype="web access" 등) LLM 으로 보냄
+    if any(any(c.isspace() for c in q.group(0)) for q in RE_QUOTED.finditer(text)):
+        return None
+
+    ov = parse_spl(text)["overview"]
+    tokens = RE_SEARCH_TERM.findall(RE_OVERVIEW.sub(" ", text))
+    if tokens and tokens[0].lower() == "search":
+        tokens = tokens[1:]
+    terms = " ".join(tokens)
+    while _wrapped_in_parens(terms):
+        terms = terms[1:-1].strip()
+    window = ", ".join(f"{k}={v}" for k, v in ov.time_window.items()) or "검색 시 선택한 시간 범위"
+
+    return (
+        "### 쿼리 전체 설명\n- 파이프 연산 없이 조건에 맞는 원본 이벤트를 그대로 조회하는 단일 검색입니다.\n\n"
+        "### 요약 Intent\n- 확실하지 않음 (검색 조건만 있는 쿼리)\n\n"
+        f"### 데이터 소스\n- index: {', '.join(ov.index) or '지정 안 됨'}\n"
+        f"- sourcetype: {', '.join(ov.sourcetype) or '지정 안 됨'}\n- 시간범위: {window}\n\n"
+        f"### 기본 필터\n- {terms or '없음'}\n\n"
+        "### 연산 단계\n- 없음 (파이프 연산 없음)\n\n"
+        "### 임계/튜닝 포인트\n- 없음\n\n"
+        "### 오탐 가능성\n- 집계/임계 없이 조건에 맞는 이벤트가 모두 반환되므로, 조건이 넓으면 결과가 많을 수 있음\n\n"
+        "### 출력/결과 필드\n- 원본 이벤트 (_time, _raw 등 기본 필드)\n\n"
+        "### 검증 결과\n- 확실하지 않음 (LLM 검증 없이 만든 로컬 요약으로, 인덱스/필드명/값은 확인하지 않음)\n"
+    )
+
+def _local_meta(spl: str, out: str, include_raw_query: bool) -> Dict[str, Any]:
+    if include_raw_query:
+        out = _prepend_raw_query(spl, out, "LOCAL", None)
+    return {
+        "engine": "LOCAL",
+        "model": None,
+        "llm_ready": is_llm_ready(),
+        "llm_error": None,
+        "truncated": False,
+        "markdown": out,
+    }
+
+def _build_meta(
+    spl: str, out: Optional[str], llm_error: Optional[str], include_raw_query: bool
 ) -> Dict[str, Any]:
-    out, llm_error = llm_explain_and_validate(spl)
     engine = "LLM" if out else "ERROR"
+    truncated = _is_truncated(spl)
     if not out:
         out = f"LLM 호출 실패: {llm_error}"
+    elif truncated:
+        out = _TRUNCATED_NOTE + out
 
     if include_raw_query:
         out = _prepend_raw_query(spl, out, engine, OPENAI_MODEL, llm_error)
@@ -161,9 +654,20 @@ def explain_spl_markdown_backend_with_meta(
         "model": OPENAI_MODEL,
         "llm_ready": is_llm_ready(),
         "llm_error": llm_error,
+        "truncated": truncated,
         "markdown": out,
     }
 
+def explain_spl_markdown_backend_with_meta(
+    spl: str,
+    include_raw_query: bool = True
+) -> Dict[str, Any]:
+    local = _local_explain(spl)
+    if local is not None:
+        return _local_meta(spl, local, include_raw_query)
+    out, llm_error = llm_explain_and_validate(spl)
+    return _build_meta(spl, out, llm_error, include_raw_query)
+
 def explain_spl_markdown_backend(
     spl: str,
     include_raw_query: bool = True
@@ -172,6 +676,92 @@ def explain_spl_markdown_backend(
         spl, include_raw_query=include_raw_query
     )["markdown"]
 
+def explain_spl_markdown_backend_stream(
+    spl: str,
+    include_raw_query: bool = True
+) -> Iterator[str]:
+    """
+    explain_spl_markdown_backend 의 스트리밍 버전: Markdown 을 조각 단위로 yield.
+    "".join(...) 하면 explain_spl_markdown_backend 와 같은 형태 (캐시된 설명은 한 번에 yield).
+    첫 조각을 받기 전에 실패하면 비스트리밍과 같은 오류 Markdown 하나만 yield 한다.
+    """
+    local = _local_explain(spl)
+    if local is not None:
+        yield _local_meta(spl, local, include_raw_query)["markdown"]
+        return
+    if _get_client() is None:
+        yield _build_meta(spl, None, "OPENAI_API_KEY not set", include_raw_query)["markdown"]
+        return
+
+    pieces = llm_explain_and_validate_stream(spl)
+    try:
+        first = next(pieces, None)
+    except Exception as e:
+        yield _build_meta(spl, None, f"{type(e).__name__}: {e}", include_raw_query)["markdown"]
+        return
+    if first is None:
+        yield _build_meta(spl, None, None, include_raw_query)["markdown"]
+        return
+
+    if include_raw_query:
+        yield _prepend_raw_query(spl, "", "LLM", OPENAI_MODEL)
+    if _is_truncated(spl):
+        yield _TRUNCATED_NOTE
+    yield first
+    try:
+        yield from pieces
+    except Exception as e:
+        # 이미 내보낸 부분은 되돌릴 수 없으므로 본문 끝에 실패 사실을 덧붙임 (이 결과는 캐시되지 않음)
+        yield f"\n\nLLM 호출 실패 (응답 도중 중단): {type(e).__name__}: {e}\n"
+
+async def aexplain_spl_markdown_backend_with_meta(
+    spl: str,
+    include_raw_query: bool = True
+) -> Dict[str, Any]:
+    local = _local_explain(spl)
+    if local is not None:
+        return _local_meta(spl, local, include_raw_query)
+    out, llm_error = await allm_explain_and_validate(spl)
+    return _build_meta(spl, out, llm_error, include_raw_query)
+
+async def aexplain_spl_markdown_backend(
+    spl: str,
+    include_raw_query: bool = True
+) -> str:
+    meta = await aexplain_spl_markdown_backend_with_meta(spl, include_raw_query=include_raw_query)
+    return meta["markdown"]
+
+async def aexplain_many(
+    spls: List[str],
+    concurrency: int = 20,
+    include_raw_query: bool = True
+) -> List[Dict[str, Any]]:
+    """여러 SPL 을 최대 concurrency 개씩 동시에 설명하고 입력 순서대로 meta 목록 반환"""
+    sem = asyncio.Semaphore(max(1, concurrency))
+
+    async def _aexplain_one(spl: str) -> Dict[str, Any]:
+        async with sem:
+            return await aexplain_spl_markdown_backend_with_meta(spl, include_raw_query=include_raw_query)
+
+    return await asyncio.gather(*(_aexplain_one(spl) for spl in spls))
+
+def explain_spl_batch(
+    spls: List[str],
+    include_raw_query: bool = True
+) -> List[str]:
+    """여러 SPL 의 설명 Markdown 을 입력 순서대로 반환 (LLM 호출은 가능한 한 한 번으로)"""
+    locals_ = [_local_explain(spl) for spl in spls]
+    llm_spls = [spl for spl, local in zip(spls, locals_) if local is None]
+    llm_results = iter(llm_explain_and_validate_batch(llm_spls) if llm_spls else [])
+    markdowns = []
+    for spl, local in zip(spls, locals_):
+        if local is not None:
+            markdowns.append(_local_meta(spl, local, include_raw_query)["markdown"])
+        else:
+            out, llm_error = next(llm_results)
+            markdowns.append(_build_meta(spl, out, llm_error, include_raw_query)["markdown"])
+    return markdowns
+
 def proccess_spl_markdown(spl : str):
     meta = explain_spl_markdown_backend_with_meta(spl, include_raw_query=True)
     return meta["markdown"]
@@ -203,8 +793,20 @@ if __name__ == "__main__":
 __all__ = [
     "parse_spl",
     "is_llm_ready",
+    "cache_clear",
     "llm_explain_and_validate",
+    "allm_explain_and_validate",
+    "llm_explain_and_validate_stream",
+    "llm_explain_and_validate_batch",
+    "submit_explain_batch",
+    "poll_explain_batch",
+    "explain_spl_markdown_batch",
     "explain_spl_markdown_backend",
     "explain_spl_markdown_backend_with_meta",
+    "explain_spl_markdown_backend_stream",
+    "aexplain_spl_markdown_backend",
+    "aexplain_spl_markdown_backend_with_meta",
+    "aexplain_many",
+    "explain_spl_batch",
     "proccess_spl_markdown",
 ]
@@ -112,12 +112,13 @@ def example_log_generation(scenario, log_count=100):
             'filename': f"{log_type['type']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         }
         
-        # 첫 3줄 미리보기
-        lines = log_content.split('\n')[:3]
+        # 첫 3줄 미리보기 (전체를 split 하지 않고 앞부분만 분리)
+        lines = log_content.split('\n', 3)[:3]
         print(f"      미리보기:")
         for line in lines:
             print(f"        {line}")
-        print(f"      총 {len(log_content.split('\\n'))} 라인 생성")
+        line_count = log_content.count('\n') + 1
+        print(f"      총 {line_count} 라인 생성")
     
     print("✅ 모든 로그 생성 완료!")
     return generated_logs
@@ -149,8 +150,7 @@ def example_download_management(generated_logs, scenario):
     
     # 출력 디렉토리 생성
     output_dir = 'exports'
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
     
     # ZIP 파일 저장
     zip_filename = f"logs_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
@@ -164,8 +164,7 @@ def example_download_management(generated_logs, scenario):
     
     # 개별 파일도 저장
     logs_dir = 'logs'
-    if not os.path.exists(logs_dir):
-        os.makedirs(logs_dir)
+    os.makedirs(logs_dir, exist_ok=True)
     
     print(f"\n📄 개별 로그 파일 저장:")
     for log_type, log_data in generated_logs.items():
@@ -175,7 +174,7 @@ def example_download_management(generated_logs, scenario):
         print(f"   • {log_data['filename']}")
     
     # 요약 보고서 생성
-    summary = download_manager.create_log_summary(generated_logs, scenario)
+    summary = download_manager.create_log_summary(generated_logs, scenario, stats=stats)
     summary_path = os.path.join(output_dir, f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
     
     with open(summary_path, 'w', encoding='utf-8') as f:
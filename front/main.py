@@ -4,8 +4,13 @@
 """
 
 import streamlit as st
+import copy
+import hashlib
 import os
+import re
+import time
 from datetime import datetime
+from itertools import chain
 from dotenv import load_dotenv
 
 # --- 기존 모듈 ---
@@ -22,7 +27,83 @@ import os
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from back.explain import explain_spl_markdown_backend
+from back.explain import explain_spl_markdown_backend, get_openai_client
+
+@st.cache_resource(show_spinner=False)
+def _load_api_key():
+    """.env 는 프로세스당 한 번만 읽는다 (Streamlit 은 rerun 마다 이 스크립트를 다시 실행)"""
+    load_dotenv()
+    return os.getenv('OPENAI_API_KEY', '')
+
+# 설명 결과 앞에 붙는 <!-- engine=...; model=... --> 메타 주석 제거용
+_META_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+
+def _content_key(text):
+    """입력 내용 기반 멱등성 키 (중복 LLM 호출 방지용)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+def _throttled_token_callback(render, interval=0.25):
+    """스트리밍 토큰 콜백 생성: 조각은 모아 두고 화면 갱신(render)은 최대 interval 초에 한 번만 (매 토큰마다 웹소켓 메시지를 보내지 않음)"""
+    buf = []
+    last = [float('-inf')]
+    def _on_token(piece):
+        buf.append(piece)
+        now = time.monotonic()
+        if now - last[0] >= interval:
+            last[0] = now
+            render("".join(buf))
+    return _on_token
+
+def _head_lines(text, n):
+    """앞 n개 라인만 잘라 반환 (전체 문자열을 split/복사하지 않음)"""
+    end = -1
+    for _ in range(n):
+        end = text.find('\n', end + 1)
+        if end < 0:
+            return text
+    return text[:end]
+
+# --- 컴포넌트 팩토리 (st.cache_resource 로 프로세스당 한 번만 생성해 rerun 간 재사용) ---
+@st.cache_resource(show_spinner=False)
+def get_progress_manager():
+    return ProgressManager()
+
+@st.cache_resource(show_spinner=False)
+def get_case_library_manager(user_id):
+    return CaseLibraryManager(user_id=user_id)
+
+@st.cache_resource(show_spinner=False)
+def get_nlp_processor(api_key):
+    return NLPProcessor(api_key, client=get_openai_client())
+
+@st.cache_resource(show_spinner=False)
+def get_scenario_manager():
+    return ScenarioManager()
+
+@st.cache_resource(show_spinner=False)
+def get_log_generator():
+    return LogGenerator()
+
+@st.cache_resource(show_spinner=False)
+def get_download_manager():
+    return DownloadManager()
+
+@st.cache_resource(show_spinner=False)
+def get_query_processor(api_key, model):
+    return QueryOptimizerService(api_key, model=model, client=get_openai_client())
+
+def _file_mtime(path):
+    """파일 mtime(ns). 파일이 없으면 0"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+
+@st.cache_data(show_spinner=False)
+def _dashboard_stats(user_id, cases_mtime, progress_revision, _scenario_manager, _case_library_manager, _progress_manager):
+    """대시보드 통계. 케이스 라이브러리 파일의 mtime 이나 진행도 리비전이 바뀔 때만 다시 계산"""
+    all_scenarios = chain(_scenario_manager.get_sample_scenarios().values(), _case_library_manager.load_cases())
+    return _progress_manager.get_dashboard_stats(user_id, all_scenarios)
 
 def main():
     st.set_page_config(
@@ -38,8 +119,7 @@ def main():
 
         st.divider()
         st.header("🔑 설정")
-        load_dotenv()
-        api_key = os.getenv('OPENAI_API_KEY', '')
+        api_key = _load_api_key()
         
         if api_key:
             st.success("✅ API 키 설정됨")
@@ -68,7 +148,7 @@ def main():
 
     if st.session_state['current_user_id'] != user_id:
         # 사용자가 변경되었으므로, 이전 사용자의 작업 내용을 초기화합니다.
-        keys_to_clear = ['processed_scenario', 'generated_logs', 'optimized_spl']
+        keys_to_clear = ['processed_scenario', 'generated_logs', 'generated_logs_zip', 'generated_logs_ts', 'optimized_spl', 'analyzed_scenarios']
         for key in keys_to_clear:
             if key in st.session_state:
                 del st.session_state[key]
@@ -76,14 +156,14 @@ def main():
         st.session_state['current_user_id'] = user_id
         st.rerun()
     
-    # --- 컴포넌트 초기화 (사용자별 관리자 추가) ---
-    progress_manager = ProgressManager()
-    case_library_manager = CaseLibraryManager(user_id=user_id)
-    nlp_processor = NLPProcessor(api_key)
-    scenario_manager = ScenarioManager()
-    log_generator = LogGenerator()
-    download_manager = DownloadManager()
-    query_processor = QueryOptimizerService(api_key, model=os.getenv("OPENAI_MODEL", "gpt-4.1"))
+    # --- 컴포넌트 초기화 (사용자별 관리자 추가, 캐시된 인스턴스 재사용) ---
+    progress_manager = get_progress_manager()
+    case_library_manager = get_case_library_manager(user_id)
+    nlp_processor = get_nlp_processor(api_key)
+    scenario_manager = get_scenario_manager()
+    log_generator = get_log_generator()
+    download_manager = get_download_manager()
+    query_processor = get_query_processor(api_key, os.getenv("OPENAI_MODEL", "gpt-4.1"))
     
     # --- 탭 구성 (순서 변경) ---
     tab_list = [
@@ -95,8 +175,12 @@ def main():
     # --- 학습 대시보드 탭 구현 ---
     with tab_dashboard:
         st.header(f"📊 {user_id}님의 학습 대시보드")
-        all_scenarios = list(scenario_manager.get_sample_scenarios().values()) + case_library_manager.load_cases()
-        stats = progress_manager.get_dashboard_stats(user_id, all_scenarios)
+        stats = _dashboard_stats(
+            user_id,
+            _file_mtime(case_library_manager.file_path),
+            progress_manager.get_revision(user_id),
+            scenario_manager, case_library_manager, progress_manager
+        )
 
         col1, col2, col3 = st.columns(3)
         col1.metric("총 시나리오", f"{stats['total_count']}개")
@@ -125,13 +209,21 @@ def main():
         with col1:
             if st.button("🔄 시나리오 분석 및 구체화", type="primary", use_container_width=True):
                 if scenario_input.strip():
-                    with st.spinner("AI가 시나리오를 분석하고 구체화하는 중..."):
-                        try:
-                            processed_scenario = nlp_processor.process_scenario(scenario_input)
-                            st.session_state['processed_scenario'] = processed_scenario
-                            st.success("✅ 시나리오 분석 완료!")
-                        except Exception as e:
-                            st.error(f"❌ 시나리오 분석 실패: {str(e)}")
+                    # 같은 입력은 LLM을 다시 호출하지 않고 이전 분석 결과를 재사용
+                    input_key = _content_key(scenario_input.strip())
+                    analyzed = st.session_state.setdefault('analyzed_scenarios', {})
+                    if input_key in analyzed:
+                        st.session_state['processed_scenario'] = analyzed[input_key]
+                        st.success("✅ 시나리오 분석 완료!")
+                    else:
+                        with st.spinner("AI가 시나리오를 분석하고 구체화하는 중..."):
+                            try:
+                                processed_scenario = nlp_processor.process_scenario(scenario_input)
+                                analyzed[input_key] = processed_scenario
+                                st.session_state['processed_scenario'] = processed_scenario
+                                st.success("✅ 시나리오 분석 완료!")
+                            except Exception as e:
+                                st.error(f"❌ 시나리오 분석 실패: {str(e)}")
                 else:
                     st.warning("시나리오를 입력해주세요.")
         with col2:
@@ -150,7 +242,11 @@ def main():
                     with st.spinner("AI가 SPL 룰을 검증하는 중..."):
                         try:
                             spl_query = st.session_state["optimized_spl"]
-                            spl_result = explain_spl_markdown_backend(spl_query)
+                            # 생성 중인 내용을 0.25초 간격으로 보여주고, 완료되면 아래 결과 영역으로 대체
+                            stream_box = st.empty()
+                            _on_token = _throttled_token_callback(stream_box.markdown)
+                            spl_result = explain_spl_markdown_backend(spl_query, on_token=_on_token)
+                            stream_box.empty()
                             st.session_state['spl_result'] = spl_result
                             st.success("✅ SPL 룰 검증 완료!")
                         except Exception as e:
@@ -158,24 +254,15 @@ def main():
         
         if 'processed_scenario' in st.session_state:
             display_processed_scenario(st.session_state['processed_scenario'])
-    
-        import re
+
         if 'spl_result' in st.session_state:
             st.subheader("📜 생성된 SPL 룰 및 검증 결과")
 
-            clean_result = st.session_state['spl_result']
-            clean_result = re.sub(r"<!--.*?-->", "", clean_result, flags=re.DOTALL).strip()
+            clean_result = _META_COMMENT.sub("", st.session_state['spl_result']).strip()
 
-            st.markdown(
-                f"""
-                <div style='max-height:400px; overflow-y:auto;
-                            background-color:#f8f9fa; padding:15px;
-                            border-radius:5px; font-size:15px;'>
-                """,
-                unsafe_allow_html=True
-            )
-            st.markdown(clean_result)
-            st.markdown("</div>", unsafe_allow_html=True)
+            # 고정 높이 스크롤 컨테이너 (HTML/CSS 문자열을 매 rerun 마다 보내지 않음)
+            with st.container(height=400, border=True):
+                st.markdown(clean_result)
 
     # --- 샘플 시나리오 탭 (st.rerun() 추가하여 즉시 반응하도록 수정) ---
     with tab_samples:
@@ -189,10 +276,17 @@ def main():
         for difficulty, scenarios in scenarios_by_difficulty.items():
             if scenarios:
                 with st.expander(f"**{difficulty} 시나리오 ({len(scenarios)}개)**", expanded=(difficulty=="초급")):
-                    for scenario in scenarios:
-                        if st.button(f"{scenario['title']}", key=f"sample_{scenario['id']}", use_container_width=True):
-                            st.session_state['processed_scenario'] = scenario
-                            st.rerun()
+                    # 항목마다 버튼을 만드는 대신 선택 상자 하나 + 불러오기 버튼 하나만 렌더링
+                    sel = st.selectbox(
+                        "시나리오", range(len(scenarios)), index=None,
+                        format_func=lambda i, s=scenarios: s[i]['title'],
+                        key=f"sample_select_{difficulty}", placeholder="시나리오를 선택하세요",
+                        label_visibility="collapsed"
+                    )
+                    if st.button("불러오기", key=f"sample_load_{difficulty}", use_container_width=True) and sel is not None:
+                        # 샘플은 프로세스 전역 공유 데이터이므로 세션에는 복사본을 저장
+                        st.session_state['processed_scenario'] = copy.deepcopy(scenarios[sel])
+                        st.rerun()
 
     # --- 케이스 라이브러리 탭 (st.rerun() 추가하여 즉시 반응하도록 수정) ---
     with tab_library:
@@ -201,10 +295,15 @@ def main():
         if not cases:
             st.info("저장된 케이스가 없습니다. '생성된 로그' 탭에서 시나리오를 저장해보세요.")
         else:
-            for case in cases:
-                if st.button(f"{case.get('title')} (난이도: {case.get('difficulty', '미지정')})", key=f"library_{case.get('id')}", use_container_width=True):
-                    st.session_state['processed_scenario'] = case
-                    st.rerun()
+            sel = st.selectbox(
+                "케이스", range(len(cases)), index=None,
+                format_func=lambda i: f"{cases[i].get('title')} (난이도: {cases[i].get('difficulty', '미지정')})",
+                key="library_select", placeholder="케이스를 선택하세요"
+            )
+            if st.button("불러오기", key="library_load", use_container_width=True) and sel is not None:
+                # 케이스 목록은 모듈 캐시와 같은 dict 를 공유하므로 세션에는 복사본을 저장
+                st.session_state['processed_scenario'] = copy.deepcopy(cases[sel])
+                st.rerun()
 
     # --- 생성된 로그 탭 (라이브러리 저장 버튼 추가) ---
     with tab_logs:
@@ -242,9 +341,15 @@ def main():
             else:
                 scenario_text = _flatten_scenario_text(processed_scn)
                 try:
-                    res = query_processor.make_spl(scenario_text=scenario_text, generated_logs=generated_logs)
+                    # 생성 중인 쿼리를 0.25초 간격으로 보여주고, 완료되면 아래 결과 영역으로 대체
+                    stream_box = st.empty()
+                    _on_spl_token = _throttled_token_callback(stream_box.code)
+                    res = query_processor.make_spl(scenario_text=scenario_text, generated_logs=generated_logs, on_token=_on_spl_token)
+                    stream_box.empty()
                     spl = (res.get("query") or "").strip()
-                    if not spl: st.error("LLM이 빈 쿼리를 반환했습니다.")
+                    # 입력이 부족해 LLM 을 부르지 않은 경우: 고정 SPL 대신 안내만 표시
+                    if res.get("warning"): st.warning(res["warning"])
+                    elif not spl: st.error("LLM이 빈 쿼리를 반환했습니다.")
                     else:
                         st.session_state["optimized_spl"] = spl
                         st.success("✅ 최적화된 쿼리를 생성했습니다.")
@@ -278,17 +383,30 @@ def generate_logs(scenario, log_generator, log_count, user_id, progress_manager)
             status_text = st.empty()
             generated_logs = {}
             total_logs = len(scenario['log_types'])
+            # 같은 생성 묶음의 파일들은 동일한 타임스탬프를 공유
+            ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+            # 진행 표시는 매번 브라우저로 메시지를 보내므로 최대 0.25초에 한 번만 갱신
+            last_update = float('-inf')
             for idx, log_type in enumerate(scenario['log_types']):
-                status_text.text(f"생성 중: {log_type['name']} ({idx + 1}/{total_logs})")
+                now = time.monotonic()
+                refresh = now - last_update >= 0.25
+                if refresh:
+                    status_text.text(f"생성 중: {log_type['name']} ({idx + 1}/{total_logs})")
                 log_content = log_generator.generate_log_content(log_type, log_count, scenario)
+                # 크기/라인 수는 생성 시 한 번만 계산해 두고 화면·ZIP·통계에서 재사용
+                encoded = log_content.encode('utf-8')
                 generated_logs[log_type['type']] = {
                     'name': log_type['name'], 'content': log_content,
-                    'filename': f"{log_type['type']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+                    'encoded': encoded, 'size': len(encoded), 'lines': log_content.count('\n') + 1,
+                    'filename': f"{log_type['type']}_{ts}.log"
                 }
-                progress = (idx + 1) / total_logs
-                progress_bar.progress(progress)
+                if refresh or idx == total_logs - 1:
+                    progress_bar.progress((idx + 1) / total_logs)
+                    last_update = now
             
             st.session_state['generated_logs'] = generated_logs
+            st.session_state.pop('generated_logs_zip', None)
+            st.session_state['generated_logs_ts'] = ts
             status_text.text("✅ 모든 로그 생성 완료!")
             
             # 진행도 기록 및 새로고침
@@ -306,10 +424,16 @@ def display_generated_logs(generated_logs, download_manager):
     st.markdown(f"**총 {len(generated_logs)}개의 로그 파일이 생성되었습니다.**")
     col1, col2 = st.columns([1, 3])
     with col1:
-        zip_data = download_manager.create_zip_archive(generated_logs)
+        # ZIP 은 로그가 새로 생성될 때만 만들고 이후 rerun 에서는 같은 바이트를 재사용
+        zip_data = st.session_state.get('generated_logs_zip')
+        if zip_data is None:
+            zip_data = download_manager.create_zip_archive(generated_logs)
+            st.session_state['generated_logs_zip'] = zip_data
+        # 파일명도 rerun 마다 바꾸지 않고 로그 파일명과 같은 생성 시각을 사용
+        ts = st.session_state.setdefault('generated_logs_ts', datetime.now().strftime('%Y%m%d_%H%M%S'))
         st.download_button(
             label="📦 전체 ZIP 다운로드", data=zip_data,
-            file_name=f"logs_archive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            file_name=f"logs_archive_{ts}.zip",
             mime="application/zip", use_container_width=True, type="primary"
         )
     st.divider()
@@ -318,13 +442,12 @@ def display_generated_logs(generated_logs, download_manager):
         with cols[idx % 2]:
             with st.container():
                 st.markdown(f"### {log_data['name']}")
-                lines = log_data['content'].split('\n')
-                st.write(f"📄 **라인 수:** {len(lines):,}개")
-                st.write(f"📏 **파일 크기:** {len(log_data['content'].encode('utf-8')):,} bytes")
+                line_count = log_data['lines']
+                st.write(f"📄 **라인 수:** {line_count:,}개")
+                st.write(f"📏 **파일 크기:** {log_data['size']:,} bytes")
                 with st.expander("👀 미리보기"):
-                    preview_lines = lines[:10]
-                    st.code('\n'.join(preview_lines), language='text')
-                    if len(lines) > 10: st.write(f"... ({len(lines) - 10}개 라인 더)")
+                    st.code(_head_lines(log_data['content'], 10), language='text')
+                    if line_count > 10: st.write(f"... ({line_count - 10}개 라인 더)")
                 st.download_button(
                     label=f"📥 {log_data['filename']}", data=log_data['content'],
                     file_name=log_data['filename'], mime="text/plain", use_container_width=True
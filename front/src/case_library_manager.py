@@ -1,7 +1,31 @@
 import os
+import re
 import json
+import tempfile
 import uuid
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import List, Dict, Any, Set, Tuple
+
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 더 빠른 직렬화 사용
+except ImportError:
+    orjson = None
+
+# bytes 를 str 로 디코드하지 않고 바로 파싱 (orjson.JSONDecodeError 는 json.JSONDecodeError 의 하위 클래스)
+_loads = orjson.loads if orjson is not None else json.loads
+
+# 파일명에 쓸 수 없는 문자 (str.isalnum() 이 참인 문자, '_', ' ' 이외의 모든 문자)
+_UNSAFE_CHARS = re.compile(r'[^\w ]')
+
+# 파일 경로 -> (mtime_ns, 케이스 목록, id 집합, 제목 집합). 파일이 바뀌지 않았으면 JSON 재파싱을 생략한다.
+# 모듈 전역이라 Streamlit rerun 사이에도 유지된다.
+_CASES_CACHE: Dict[str, Tuple[int, List[Dict[str, Any]], Set[str], Set[str]]] = {}
+
+def _cache_entry(mtime: int, cases: List[Dict[str, Any]]):
+    """캐시 항목 생성 (중복 검사용 id/제목 인덱스 포함)"""
+    ids = {c['id'] for c in cases if c.get('id')}
+    titles = {c.get('title') for c in cases}
+    return mtime, cases, ids, titles
 
 class CaseLibraryManager:
     def __init__(self, user_id: str):
@@ -12,7 +36,7 @@ class CaseLibraryManager:
             user_id (str): 사용자 식별자
         """
         # 사용자 이름으로 사용할 수 없는 문자를 제거하여 안전한 파일명 생성
-        safe_user_id = "".join(c for c in user_id if c.isalnum() or c in (' ', '_')).rstrip()
+        safe_user_id = _UNSAFE_CHARS.sub('', user_id).rstrip()
         if not safe_user_id:
             # 기본 사용자 이름 설정 (오류 방지)
             safe_user_id = "default_user"
@@ -25,21 +49,46 @@ class CaseLibraryManager:
         self.file_path = os.path.join(self.data_dir, f'case_library_{self.user_id}.json')
 
     def _save_cases(self, cases: List[Dict[str, Any]]):
-        """케이스 데이터를 사용자의 JSON 파일에 저장"""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(cases, f, ensure_ascii=False, indent=4)
+        """케이스 데이터를 사용자의 JSON 파일에 저장 (임시 파일에 쓴 뒤 교체해 손상 방지)"""
+        # orjson 은 2칸 들여쓰기만 지원하므로 json 도 2칸으로 맞춰 어느 쪽이든 같은 형식으로 저장
+        if orjson is not None:
+            data = orjson.dumps(cases, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(cases, ensure_ascii=False, indent=2).encode('utf-8')
+        # 동시에 저장해도 서로의 임시 파일을 덮어쓰지 않도록 저장마다 고유한 임시 파일 사용
+        fd, tmp_path = tempfile.mkstemp(dir=self.data_dir, prefix=os.path.basename(self.file_path) + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.file_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        # 방금 쓴 내용으로 캐시 갱신 (mtime 해상도가 낮은 파일시스템에서도 최신 상태 유지)
+        _CASES_CACHE[self.file_path] = _cache_entry(os.stat(self.file_path).st_mtime_ns, list(cases))
 
     def load_cases(self) -> List[Dict[str, Any]]:
-        """사용자별 케이스 라이브러리 파일 로드 및 자동 복구"""
-        if not os.path.exists(self.file_path):
-            return []
+        """사용자별 케이스 라이브러리 파일 로드 및 자동 복구 (파일 mtime 기준 캐시)"""
+        entry = self._load_entry()
+        return list(entry[1]) if entry else []
+
+    def _load_entry(self):
+        """캐시 항목 (mtime, 케이스, id 집합, 제목 집합) 반환. 파일이 없거나 손상되면 None"""
+        try:
+            mtime = os.stat(self.file_path).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = _CASES_CACHE.get(self.file_path)
+        if cached is not None and cached[0] == mtime:
+            return cached
         
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if not content:
-                    return []
-                cases = json.loads(content)
+            data = Path(self.file_path).read_bytes()
+            cases = _loads(data) if data else []
             
             needs_update = False
             for case in cases:
@@ -49,22 +98,25 @@ class CaseLibraryManager:
             
             if needs_update:
                 self._save_cases(cases)
+            else:
+                _CASES_CACHE[self.file_path] = _cache_entry(mtime, cases)
 
-            return cases
+            return _CASES_CACHE[self.file_path]
         except (json.JSONDecodeError, IOError):
-            return []
+            return None
 
     def add_case(self, scenario_data: Dict[str, Any]) -> bool:
         """새로운 케이스를 사용자의 라이브러리에 추가"""
-        cases = self.load_cases()
+        entry = self._load_entry()
+        cases, ids, titles = (list(entry[1]), entry[2], entry[3]) if entry else ([], set(), set())
         
         if 'id' not in scenario_data or not scenario_data.get('id'):
             scenario_data['id'] = str(uuid.uuid4())
         
-        if any(c.get('id') == scenario_data['id'] for c in cases):
+        if scenario_data['id'] in ids:
             return False
 
-        if any(c.get('title') == scenario_data.get('title') for c in cases):
+        if scenario_data.get('title') in titles:
             return False
 
         cases.append(scenario_data)
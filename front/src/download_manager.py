@@ -5,7 +5,7 @@
 
 import zipfile
 import io
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
 class DownloadManager:
@@ -27,21 +27,52 @@ class DownloadManager:
         # 메모리 내에서 ZIP 파일 생성
         zip_buffer = io.BytesIO()
         
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # 각 로그 파일을 ZIP에 추가
+        # 텍스트 로그는 기본 레벨(6)로 얻는 압축 이득이 작으므로 가장 빠른 레벨 1 사용
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+            # 각 로그 파일을 ZIP에 추가 (인코딩 결과는 로그 dict 에 보관해 통계/README 와 공유)
             for log_type, log_data in generated_logs.items():
-                file_name = log_data['filename']
-                file_content = log_data['content']
-                
-                # ZIP 파일에 로그 추가
-                zip_file.writestr(file_name, file_content.encode('utf-8'))
+                zip_file.writestr(log_data['filename'], self._encoded_content(log_data))
             
             # README 파일 추가
             readme_content = self._generate_readme(generated_logs)
             zip_file.writestr('README.txt', readme_content.encode('utf-8'))
         
-        zip_buffer.seek(0)
-        return zip_buffer.read()
+        # read() 는 버퍼를 한 번 더 복사하므로 getvalue() 로 바로 반환
+        return zip_buffer.getvalue()
+    
+    def _encoded_content(self, log_data: Dict[str, Any]) -> bytes:
+        """
+        로그 내용의 UTF-8 바이트 (최초 1회만 인코딩하고 log_data['encoded']에 보관)
+        
+        Args:
+            log_data (Dict[str, Any]): 단일 로그 데이터
+            
+        Returns:
+            bytes: UTF-8 인코딩된 로그 내용
+        """
+        
+        encoded = log_data.get('encoded')
+        if encoded is None:
+            encoded = log_data['content'].encode('utf-8')
+            log_data['encoded'] = encoded
+        return encoded
+    
+    def _content_stats(self, log_data: Dict[str, Any]) -> Tuple[int, int]:
+        """
+        로그 파일의 (바이트 크기, 라인 수) 반환
+        생성 시 미리 계산된 'size'/'lines'가 있으면 그대로 사용
+        
+        Args:
+            log_data (Dict[str, Any]): 단일 로그 데이터
+            
+        Returns:
+            Tuple[int, int]: (크기, 라인 수)
+        """
+        
+        if 'size' in log_data and 'lines' in log_data:
+            return log_data['size'], log_data['lines']
+        encoded = self._encoded_content(log_data)
+        return len(encoded), encoded.count(b'\n') + 1
     
     def _generate_readme(self, generated_logs: Dict[str, Dict[str, Any]]) -> str:
         """
@@ -54,7 +85,8 @@ class DownloadManager:
             str: README 파일 내용
         """
         
-        readme_content = f"""
+        # 문자열 += 반복은 매번 전체를 복사하므로 조각을 모아 마지막에 한 번만 합친다
+        parts = [f"""
 시나리오 기반 다중 로그 생성기
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
@@ -62,20 +94,19 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 
 생성된 로그 파일 목록:
 {'='*50}
-"""
+"""]
         
         for log_type, log_data in generated_logs.items():
-            lines_count = len(log_data['content'].split('\n'))
-            file_size = len(log_data['content'].encode('utf-8'))
+            file_size, lines_count = self._content_stats(log_data)
             
-            readme_content += f"""
+            parts.append(f"""
 📄 {log_data['filename']}
    - 시스템: {log_data['name']}
    - 로그 라인 수: {lines_count:,}개
    - 파일 크기: {self._format_file_size(file_size)}
-"""
+""")
         
-        readme_content += f"""
+        parts.append(f"""
 
 사용 방법:
 {'='*50}
@@ -94,9 +125,9 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - 개발: 시나리오 기반 다중 로그 생성기
 - 버전: 1.0
 - 생성 엔진: AI 기반 자연어 처리
-"""
+""")
         
-        return readme_content
+        return "".join(parts)
     
     def _format_file_size(self, size_bytes: int) -> str:
         """
@@ -136,8 +167,7 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         file_details = []
         
         for log_type, log_data in generated_logs.items():
-            lines = len(log_data['content'].split('\n'))
-            size = len(log_data['content'].encode('utf-8'))
+            size, lines = self._content_stats(log_data)
             
             total_lines += lines
             total_size += size
@@ -160,21 +190,24 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         }
     
     def create_log_summary(self, generated_logs: Dict[str, Dict[str, Any]], 
-                          scenario: Dict[str, Any]) -> str:
+                          scenario: Dict[str, Any],
+                          stats: Optional[Dict[str, Any]] = None) -> str:
         """
         로그 생성 요약 정보 생성
         
         Args:
             generated_logs (Dict[str, Dict[str, Any]]): 생성된 로그 데이터
             scenario (Dict[str, Any]): 시나리오 정보
+            stats (Optional[Dict[str, Any]]): 이미 계산한 get_file_statistics 결과 (없으면 새로 계산)
             
         Returns:
             str: 요약 정보
         """
         
-        stats = self.get_file_statistics(generated_logs)
+        if stats is None:
+            stats = self.get_file_statistics(generated_logs)
         
-        summary = f"""
+        parts = [f"""
 📊 로그 생성 요약 보고서
 {'='*60}
 
@@ -190,18 +223,18 @@ Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
    생성 시간: {stats['generated_at']}
 
 📋 파일 상세 정보:
-"""
+"""]
         
         for detail in stats['file_details']:
-            summary += f"""   • {detail['name']} ({detail['filename']})
+            parts.append(f"""   • {detail['name']} ({detail['filename']})
      라인 수: {detail['lines']:,}개, 크기: {detail['size_formatted']}
-"""
+""")
         
-        summary += f"""
+        parts.append(f"""
 🔄 공격 타임라인:
-"""
+""")
         
         for i, step in enumerate(scenario.get('timeline', []), 1):
-            summary += f"   {i}. {step}\n"
+            parts.append(f"   {i}. {step}\n")
         
-        return summary
\ No newline at end of file
+        return "".join(parts)
\ No newline at end of file
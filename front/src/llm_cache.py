@@ -0,0 +1,70 @@
+"""
+LLM 응답 캐시 모듈
+동일한 (모델, 프롬프트) 요청의 응답 본문을 메모리 LRU에 보관해 API 재호출을 생략
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# 키 계산 시 옵션 해시에서 빼는 인자 (model/messages 는 따로 해시, stream 은 응답 본문과 무관)
+_KEY_EXCLUDED = frozenset(("model", "messages", "stream"))
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 256):
+        """
+        응답 캐시 초기화
+
+        Args:
+            max_entries (int): 보관할 최대 응답 수 (초과 시 가장 오래 안 쓴 항목부터 제거)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def request_key(request: Dict[str, Any]) -> str:
+        """
+        chat.completions.create 인자에서 캐시 키 생성
+        모델, 모든 메시지 본문(시스템 프롬프트 포함), 생성 옵션(temperature, response_format, max_tokens 등)을
+        해시하므로 그중 하나라도 바뀌면 다른 요청으로 취급됨 (stream 여부는 응답 본문에 영향이 없어 제외)
+
+        Args:
+            request (Dict[str, Any]): chat.completions.create 인자
+
+        Returns:
+            str: SHA-256 16진 문자열
+        """
+        h = hashlib.sha256(request["model"].encode("utf-8"))
+        for message in request["messages"]:
+            h.update(b"\0")
+            h.update(message["role"].encode("utf-8"))
+            h.update(b"\0")
+            h.update(message["content"].encode("utf-8"))
+        options = {k: v for k, v in request.items() if k not in _KEY_EXCLUDED}
+        h.update(b"\0")
+        h.update(json.dumps(options, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """캐시된 응답 본문 반환 (없으면 None)"""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: str, content: str) -> None:
+        """응답 본문 저장"""
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
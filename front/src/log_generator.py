@@ -3,70 +3,213 @@
 시나리오에 따라 각 시스템별로 실제적인 로그를 생성
 """
 
+import os
 import random
 import datetime
-from typing import Dict, Any, List
-import ipaddress
-import uuid
+import functools
+import time
+from typing import Dict, Any, IO, List, Optional, Tuple
+
+# random 모듈 함수 별칭 (로그 라인마다 반복되는 모듈 속성 조회 제거, random.seed 는 그대로 적용됨)
+_choice = random.choice
+_random = random.random
+_randint = random.randint
+_randrange = random.randrange
+_uniform = random.uniform
+
+# -----------------------------
+# 데이터 풀 (불변 tuple 로 모듈 로드 시 한 번만 생성)
+# -----------------------------
+# IP 주소 풀
+_INTERNAL_IPS = (
+    "192.168.1.100", "192.168.1.150", "192.168.1.200",
+    "10.0.0.50", "10.0.0.100", "10.0.0.200",
+    "172.16.0.25", "172.16.0.50", "172.16.0.100"
+)
+
+_EXTERNAL_IPS = (
+    "203.250.133.88", "8.8.8.8", "1.1.1.1",
+    "185.220.100.240", "94.130.135.25", "45.33.32.156"
+)
+
+_MALICIOUS_IPS = (
+    "185.220.101.42", "194.147.142.25", "45.134.26.45",
+    "91.200.81.15", "159.89.214.31", "167.99.74.55"
+)
+
+# 도메인 풀
+_NORMAL_DOMAINS = (
+    "google.com", "microsoft.com", "amazon.com", "facebook.com",
+    "github.com", "stackoverflow.com", "linkedin.com"
+)
+
+_MALICIOUS_DOMAINS = (
+    "evil-c2.com", "malicious-site.com", "phishing-bank.com",
+    "fake-update.net", "suspicious-download.org"
+)
+
+# 사용자 계정 풀 (자주 쓰는 앞부분 슬라이스도 미리 만들어 둠)
+_USER_ACCOUNTS = (
+    "admin", "user1", "user2", "service", "backup",
+    "john.doe", "jane.smith", "bob.wilson", "alice.johnson"
+)
+_USER_ACCOUNTS_NORMAL = _USER_ACCOUNTS[:5]
+_USER_ACCOUNTS_FIRST3 = _USER_ACCOUNTS[:3]
+
+# 파일 경로 풀
+_FILE_PATHS = (
+    "/var/log/access.log", "/home/user/documents/",
+    "/opt/application/config/", "/tmp/",
+    "C:\\Users\\admin\\Documents\\", "C:\\Windows\\System32\\",
+    "C:\\Program Files\\Application\\"
+)
+
+# 프로세스 풀
+_PROCESSES = (
+    "chrome.exe", "firefox.exe", "notepad.exe", "cmd.exe",
+    "powershell.exe", "svchost.exe", "explorer.exe",
+    "malware.exe", "backdoor.exe", "keylogger.exe"
+)
+
+# 타임스탬프 형식 (웹서버만 access log 형식 사용)
+_TIME_FMT = '%Y-%m-%d %H:%M:%S'
+_TIME_FORMATS = {'webserver': '%d/%b/%Y:%H:%M:%S +0000'}
+
+# 방화벽 단계별 설정 (인덱스 = min(phase, 4)):
+# (출발지 IP 풀, 임계값, 난수 < 임계값일 때 액션, 그 외 액션, 목적지 포트 풀)
+_FW_RECON = (_EXTERNAL_IPS, 0.8, "ALLOW", "DENY", (80, 443, 22, 21, 25))        # 초기 정찰
+_FW_ATTACK = (_MALICIOUS_IPS, 0.6, "DENY", "ALLOW", (80, 443, 8080, 3389, 445))  # 공격 시도
+_FW_POST = (_MALICIOUS_IPS, 0.7, "ALLOW", "DENY", (443, 80, 53, 443))            # 공격 성공 후
+_FW_PHASE_CFG = (_FW_RECON, _FW_RECON, _FW_ATTACK, _FW_ATTACK, _FW_POST)
+
+# 웹서버
+_WEB_NORMAL_PATHS = ('/', '/index.html', '/about.html', '/contact.html', '/products')
+_WEB_ATTACK_PATHS = ('/admin/', '/login.php', '/admin/login.php', '/wp-admin/', '/phpmyadmin/')
+_WEB_USER_AGENTS = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'curl/7.64.1',
+    'sqlmap/1.4.7',
+    'Nikto/2.1.6'
+)
+_WEB_ATTACK_USER_AGENTS = _WEB_USER_AGENTS[1:]
+
+# WAF
+_WAF_ATTACK_TYPES = ('SQL_INJECTION', 'XSS', 'LFI', 'RFI', 'CSRF', 'COMMAND_INJECTION')
+_WAF_ATTACK_SEVERITIES = ('MEDIUM', 'HIGH', 'CRITICAL')
+
+# 공격 페이로드
+_ATTACK_PAYLOADS = {
+    'SQL_INJECTION': (
+        "' OR 1=1--", "' UNION SELECT null,null--", "'; DROP TABLE users--",
+        "1' AND (SELECT COUNT(*) FROM information_schema.tables)>0--"
+    ),
+    'XSS': (
+        "<script>alert('XSS')</script>", "<img src=x onerror=alert(1)>",
+        "javascript:alert(document.cookie)"
+    ),
+    'LFI': (
+        "../../../etc/passwd", "..\\..\\..\\windows\\system32\\drivers\\etc\\hosts"
+    ),
+    'COMMAND_INJECTION': (
+        "; cat /etc/passwd", "| whoami", "&& dir C:\\"
+    )
+}
+_DEFAULT_PAYLOADS = ("malicious_payload",)
+# WAF 공격 유형 인덱스 -> 페이로드 풀 (문자열 키 조회 없이 같은 인덱스로 바로 선택)
+_WAF_ATTACK_PAYLOADS = tuple(_ATTACK_PAYLOADS.get(a, _DEFAULT_PAYLOADS) for a in _WAF_ATTACK_TYPES)
+
+# DB
+_DB_NORMAL_TABLES = ('users', 'products', 'orders', 'customers')
+
+# 이메일
+_INTERNAL_EMAILS = ('user@company.com', 'admin@company.com', 'support@company.com')
+_EXTERNAL_EMAILS = ('contact@partner.com', 'info@supplier.com')
+_MALICIOUS_EMAILS = ('attacker@evil.com', 'phishing@fake-bank.com')
+_EMAIL_SENDERS_ALL = _INTERNAL_EMAILS + _EXTERNAL_EMAILS
+_EMAIL_SUBJECTS = ('Meeting Schedule', 'Project Update', 'Important Document', 'Urgent Action Required')
+_EMAIL_MALICIOUS_SUBJECTS = ('Account Verification Required', 'Security Alert', 'Invoice #12345')
+
+# 엔드포인트
+_EP_NORMAL_PROCESSES = ('chrome.exe', 'notepad.exe', 'outlook.exe', 'excel.exe')
+_EP_MALICIOUS_PROCESSES = ('malware.exe', 'backdoor.exe', 'keylogger.exe', 'ransomware.exe')
+_EP_EVENTS = ('PROCESS_START', 'PROCESS_STOP', 'FILE_WRITE', 'REGISTRY_MODIFY', 'NETWORK_CONNECT')
+_EP_EVENTS_START_STOP = _EP_EVENTS[:2]
+_EP_EVENTS_FILE_REG_NET = _EP_EVENTS[2:]
+
+# 네트워크 (단계별 목적지 포트 풀, 인덱스 = min(phase, 4))
+_NET_SCAN_PORTS = (80, 443, 22, 3389, 445, 135, 1433, 3306)
+_NET_NORMAL_PORTS = (80, 443, 22)
+_NET_LATERAL_PORTS = (445, 135, 3389)  # SMB, RPC, RDP
+_NET_PHASE_PORTS = (_NET_NORMAL_PORTS, _NET_NORMAL_PORTS, _NET_SCAN_PORTS, _NET_SCAN_PORTS, _NET_LATERAL_PORTS)
+
+# 파일서버
+_FS_NORMAL_FILES = ('document.pdf', 'report.xlsx', 'customer_data.csv')
+
+# USB
+_USB_DEVICE_IDS = ('USB_DEVICE_001', 'USB_DEVICE_002', 'USB_DEVICE_003')
+
+# DLP
+_DLP_CHANNELS_NORMAL = ('EMAIL', 'USB', 'WEB')
+_DLP_POLICIES = ('PII_PROTECTION', 'CREDIT_CARD_DATA', 'CONFIDENTIAL_DOCS', 'FINANCIAL_DATA')
+
+# 라우터
+_ROUTER_INTERFACES = ('eth0', 'eth1', 'wan0', 'lan0')
+
+# 로드밸런서
+_LB_SERVERS = ('web01', 'web02', 'web03', 'web04')
+
+# CDN
+_CDN_EDGES = ('edge01.cdn.com', 'edge02.cdn.com', 'edge03.cdn.com')
+_CDN_RESOURCES = ('/css/style.css', '/js/app.js', '/images/logo.png', '/api/data', '/index.html')
+
+# 백업
+_BACKUP_TYPES = ('FULL', 'INCREMENTAL', 'DIFFERENTIAL')
+
+@functools.lru_cache(maxsize=8)
+def _make_time_strs(fmt: str, base_epoch: int, count: int, step: int) -> Tuple[str, ...]:
+    """base_epoch 부터 step 초 간격인 count 개의 시간 문자열 (같은 기준 시각의 다른 로그 타입 호출은 캐시 재사용)"""
+    return tuple(time.strftime(fmt, time.localtime(base_epoch + i * step)) for i in range(count))
 
 class LogGenerator:
     def __init__(self):
         """로그 생성기 초기화"""
         self.init_data_pools()
+        
+        # 로그 생성 함수 매핑 (바운드 메서드를 한 번만 만들어 재사용)
+        self._generators = {
+            'firewall': self._generate_firewall_log,
+            'webserver': self._generate_webserver_log,
+            'waf': self._generate_waf_log,
+            'auth': self._generate_auth_log,
+            'database': self._generate_database_log,
+            'proxy': self._generate_proxy_log,
+            'email': self._generate_email_log,
+            'endpoint': self._generate_endpoint_log,
+            'dns': self._generate_dns_log,
+            'network': self._generate_network_log,
+            'fileserver': self._generate_fileserver_log,
+            'usb': self._generate_usb_log,
+            'dlp': self._generate_dlp_log,
+            'router': self._generate_router_log,
+            'loadbalancer': self._generate_loadbalancer_log,
+            'cdn': self._generate_cdn_log,
+            'backup': self._generate_backup_log
+        }
     
     def init_data_pools(self):
-        """로그 생성에 사용할 데이터 풀 초기화"""
-        
-        # IP 주소 풀
-        self.internal_ips = [
-            "192.168.1.100", "192.168.1.150", "192.168.1.200",
-            "10.0.0.50", "10.0.0.100", "10.0.0.200",
-            "172.16.0.25", "172.16.0.50", "172.16.0.100"
-        ]
-        
-        self.external_ips = [
-            "203.250.133.88", "8.8.8.8", "1.1.1.1",
-            "185.220.100.240", "94.130.135.25", "45.33.32.156"
-        ]
-        
-        self.malicious_ips = [
-            "185.220.101.42", "194.147.142.25", "45.134.26.45",
-            "91.200.81.15", "159.89.214.31", "167.99.74.55"
-        ]
-        
-        # 도메인 풀
-        self.normal_domains = [
-            "google.com", "microsoft.com", "amazon.com", "facebook.com",
-            "github.com", "stackoverflow.com", "linkedin.com"
-        ]
-        
-        self.malicious_domains = [
-            "evil-c2.com", "malicious-site.com", "phishing-bank.com",
-            "fake-update.net", "suspicious-download.org"
-        ]
-        
-        # 사용자 계정 풀
-        self.user_accounts = [
-            "admin", "user1", "user2", "service", "backup",
-            "john.doe", "jane.smith", "bob.wilson", "alice.johnson"
-        ]
-        
-        # 파일 경로 풀
-        self.file_paths = [
-            "/var/log/access.log", "/home/user/documents/",
-            "/opt/application/config/", "/tmp/",
-            "C:\\Users\\admin\\Documents\\", "C:\\Windows\\System32\\",
-            "C:\\Program Files\\Application\\"
-        ]
-        
-        # 프로세스 풀
-        self.processes = [
-            "chrome.exe", "firefox.exe", "notepad.exe", "cmd.exe",
-            "powershell.exe", "svchost.exe", "explorer.exe",
-            "malware.exe", "backdoor.exe", "keylogger.exe"
-        ]
+        """로그 생성에 사용할 데이터 풀 초기화 (모듈 상수 tuple 을 그대로 참조)"""
+        
+        self.internal_ips = _INTERNAL_IPS
+        self.external_ips = _EXTERNAL_IPS
+        self.malicious_ips = _MALICIOUS_IPS
+        self.normal_domains = _NORMAL_DOMAINS
+        self.malicious_domains = _MALICIOUS_DOMAINS
+        self.user_accounts = _USER_ACCOUNTS
+        self.file_paths = _FILE_PATHS
+        self.processes = _PROCESSES
     
-    def generate_log_content(self, log_type: Dict[str, str], count: int, scenario: Dict[str, Any]) -> str:
+    def generate_log_content(self, log_type: Dict[str, str], count: int, scenario: Dict[str, Any],
+                             output: Optional[IO[str]] = None) -> Optional[str]:
         """
         로그 컨텐츠 생성
         
@@ -74,39 +217,102 @@ class LogGenerator:
             log_type (Dict[str, str]): 로그 타입 정보
             count (int): 생성할 로그 개수
             scenario (Dict[str, Any]): 시나리오 정보
+            output (Optional[IO[str]]): 지정하면 전체 문자열을 만들지 않고 공격 단계 단위로 이 스트림에 기록
             
         Returns:
-            str: 생성된 로그 컨텐츠
+            Optional[str]: 생성된 로그 컨텐츠 (output 을 지정한 경우 None)
         """
         
-        logs = []
-        base_time = datetime.datetime.now() - datetime.timedelta(hours=2)
-        timeline_phases = len(scenario['timeline'])
+        base_epoch, attack_type, bounds = self._batch_params(count, scenario)
         
-        for i in range(count):
-            # 현재 로그가 속하는 공격 단계 계산
-            phase = int((i / count) * timeline_phases)
-            
-            # 시간 계산 (순차적으로 증가)
-            timestamp = base_time + datetime.timedelta(seconds=i * 2)
+        # 시간 문자열은 로그 타입의 형식으로 루프 전에 한 번에 만들어 둔다 (2초 간격으로 증가)
+        time_strs = _make_time_strs(_TIME_FORMATS.get(log_type['type'], _TIME_FMT), base_epoch, count, 2)
+        
+        # 로그 타입은 호출 내내 같으므로 생성 함수는 루프 밖에서 한 번만 결정
+        generator = self._generators.get(log_type['type'], self._generate_generic_log)
+        
+        if output is None:
+            return self._build_logs(generator, time_strs, bounds, attack_type, count)
+        
+        # 스트림 모드: 한 단계 분량만 모아 기록하므로 메모리에는 전체 로그 문자열이 만들어지지 않음
+        first = True
+        for phase in range(len(bounds) - 1):
+            lo, hi = bounds[phase], bounds[phase + 1]
+            if lo == hi:
+                continue
+            if not first:
+                output.write('\n')
+            output.write('\n'.join([generator(time_strs[i], phase, attack_type, i, count) for i in range(lo, hi)]))
+            first = False
+        return None
+    
+    def generate_log_content_multi(self, log_types: List[Dict[str, str]], count: int,
+                                   scenario: Dict[str, Any]) -> Dict[str, str]:
+        """
+        여러 로그 타입을 한 번에 생성 (기준 시각, 공격 단계 구간, 시간 문자열을 타입 간에 공유)
+        
+        Args:
+            log_types (List[Dict[str, str]]): 로그 타입 정보 목록
+            count (int): 타입별로 생성할 로그 개수
+            scenario (Dict[str, Any]): 시나리오 정보
             
-            # 로그 타입별 생성 함수 호출
-            log_entry = self._generate_single_log(
-                log_type['type'], timestamp, phase, scenario, i, count
-            )
+        Returns:
+            Dict[str, str]: 로그 타입 -> 생성된 로그 컨텐츠
+        """
+        
+        base_epoch, attack_type, bounds = self._batch_params(count, scenario)
+        
+        results = {}
+        for log_type in log_types:
+            type_name = log_type['type']
+            time_strs = _make_time_strs(_TIME_FORMATS.get(type_name, _TIME_FMT), base_epoch, count, 2)
+            generator = self._generators.get(type_name, self._generate_generic_log)
+            results[type_name] = self._build_logs(generator, time_strs, bounds, attack_type, count)
+        return results
+    
+    def _batch_params(self, count: int, scenario: Dict[str, Any]) -> Tuple[int, str, List[int]]:
+        """
+        한 번의 생성에 공통으로 쓰는 값 계산
+        
+        Args:
+            count (int): 생성할 로그 개수
+            scenario (Dict[str, Any]): 시나리오 정보
             
-            logs.append(log_entry)
+        Returns:
+            Tuple[int, str, List[int]]: (기준 epoch 초, 공격 유형, 공격 단계별 인덱스 경계)
+        """
+        
+        # 기준 시각은 정수 epoch 초로만 다루고 datetime/timedelta 객체는 로그마다 만들지 않는다
+        base_epoch = int((datetime.datetime.now() - datetime.timedelta(hours=2)).timestamp())
+        # 시나리오에서 필요한 값은 루프 전에 지역 변수로 꺼내 두고 생성 함수에는 값만 전달
+        attack_type = scenario.get('attack_type', 'unknown')
+        
+        # 공격 단계별 로그 인덱스 구간을 미리 계산 (단계 p = int(i / count * 단계 수) 인 i 는
+        # [ceil(p*count/단계 수), ceil((p+1)*count/단계 수)) 구간) 해서 루프 안에서는 단계가 상수
+        phases = max(len(scenario['timeline']), 1)
+        bounds = [-(-p * count // phases) for p in range(phases + 1)]
+        return base_epoch, attack_type, bounds
+    
+    def _build_logs(self, generator, time_strs: Tuple[str, ...], bounds: List[int],
+                    attack_type: str, count: int) -> str:
+        """공격 단계 구간별로 생성 함수를 호출해 전체 로그 문자열 생성"""
+        
+        logs = [None] * count  # 개수를 알고 있으므로 미리 할당하고 인덱스로 채움
+        for phase in range(len(bounds) - 1):
+            for i in range(bounds[phase], bounds[phase + 1]):
+                # 로그 타입별 생성 함수 호출
+                logs[i] = generator(time_strs[i], phase, attack_type, i, count)
         
         return '\n'.join(logs)
     
-    def _generate_single_log(self, log_type: str, timestamp: datetime.datetime, 
+    def _generate_single_log(self, log_type: str, time_str: str, 
                            phase: int, scenario: Dict[str, Any], index: int, total: int) -> str:
         """
         단일 로그 엔트리 생성
         
         Args:
             log_type (str): 로그 타입
-            timestamp (datetime.datetime): 로그 시간
+            time_str (str): 로그 타입 형식으로 포맷된 로그 시간
             phase (int): 공격 단계
             scenario (Dict[str, Any]): 시나리오 정보
             index (int): 현재 로그 인덱스
@@ -116,516 +322,366 @@ class LogGenerator:
             str: 단일 로그 엔트리
         """
         
-        # 로그 생성 함수 매핑
-        generators = {
-            'firewall': self._generate_firewall_log,
-            'webserver': self._generate_webserver_log,
-            'waf': self._generate_waf_log,
-            'auth': self._generate_auth_log,
-            'database': self._generate_database_log,
-            'proxy': self._generate_proxy_log,
-            'email': self._generate_email_log,
-            'endpoint': self._generate_endpoint_log,
-            'dns': self._generate_dns_log,
-            'network': self._generate_network_log,
-            'fileserver': self._generate_fileserver_log,
-            'usb': self._generate_usb_log,
-            'dlp': self._generate_dlp_log,
-            'router': self._generate_router_log,
-            'loadbalancer': self._generate_loadbalancer_log,
-            'cdn': self._generate_cdn_log,
-            'backup': self._generate_backup_log
-        }
-        
-        generator = generators.get(log_type, self._generate_generic_log)
-        return generator(timestamp, phase, scenario, index, total)
+        generator = self._generators.get(log_type, self._generate_generic_log)
+        return generator(time_str, phase, scenario.get('attack_type', 'unknown'), index, total)
     
-    def _generate_firewall_log(self, timestamp: datetime.datetime, phase: int, 
-                              scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_firewall_log(self, time_str: str, phase: int, 
+                              attack_type: str, index: int, total: int) -> str:
         """방화벽 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        # 공격 단계에 따른 로그 패턴 변경 (분기 대신 단계별 설정 표 조회)
+        src_pool, threshold, action_below, action_above, ports = _FW_PHASE_CFG[phase if phase < 4 else 4]
+        src_ip = _choice(src_pool)
+        dst_ip = _choice(_INTERNAL_IPS)
+        action = action_below if _random() < threshold else action_above
+        port = _choice(ports)
         
-        # 공격 단계에 따른 로그 패턴 변경
-        if phase < 2:  # 초기 정찰
-            src_ip = random.choice(self.external_ips)
-            dst_ip = random.choice(self.internal_ips)
-            action = "ALLOW" if random.random() < 0.8 else "DENY"
-            port = random.choice([80, 443, 22, 21, 25])
-        elif phase < 4:  # 공격 시도
-            src_ip = random.choice(self.malicious_ips)
-            dst_ip = random.choice(self.internal_ips)
-            action = "DENY" if random.random() < 0.6 else "ALLOW"
-            port = random.choice([80, 443, 8080, 3389, 445])
-        else:  # 공격 성공 후
-            src_ip = random.choice(self.malicious_ips)
-            dst_ip = random.choice(self.internal_ips)
-            action = "ALLOW" if random.random() < 0.7 else "DENY"
-            port = random.choice([443, 80, 53, 443])
-        
-        return f"{time_str} [FIREWALL] SRC={src_ip} DST={dst_ip} PROTO=TCP SPORT={random.randint(1024, 65535)} DPORT={port} ACTION={action} LEN={random.randint(40, 1500)}"
+        return f"{time_str} [FIREWALL] SRC={src_ip} DST={dst_ip} PROTO=TCP SPORT={_randint(1024, 65535)} DPORT={port} ACTION={action} LEN={_randint(40, 1500)}"
     
-    def _generate_webserver_log(self, timestamp: datetime.datetime, phase: int,
-                               scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_webserver_log(self, time_str: str, phase: int,
+                               attack_type: str, index: int, total: int) -> str:
         """웹서버 로그 생성"""
         
-        time_str = timestamp.strftime('%d/%b/%Y:%H:%M:%S +0000')
-        
-        methods = ['GET', 'POST', 'PUT', 'DELETE', 'HEAD']
-        normal_paths = ['/', '/index.html', '/about.html', '/contact.html', '/products']
-        attack_paths = ['/admin/', '/login.php', '/admin/login.php', '/wp-admin/', '/phpmyadmin/']
-        
-        user_agents = [
-            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-            'curl/7.64.1',
-            'sqlmap/1.4.7',
-            'Nikto/2.1.6'
-        ]
-        
         if phase < 2:  # 정상 트래픽
-            method = random.choice(['GET', 'POST'])
-            path = random.choice(normal_paths)
-            status = random.choice([200, 304, 404])
-            user_agent = user_agents[0]
-            src_ip = random.choice(self.external_ips)
+            method = _choice(('GET', 'POST'))
+            path = _choice(_WEB_NORMAL_PATHS)
+            status = _choice((200, 304, 404))
+            user_agent = _WEB_USER_AGENTS[0]
+            src_ip = _choice(_EXTERNAL_IPS)
         elif phase < 4:  # 공격 시도
-            method = random.choice(['GET', 'POST'])
-            path = random.choice(attack_paths)
+            method = _choice(('GET', 'POST'))
+            path = _choice(_WEB_ATTACK_PATHS)
             if "' OR 1=1" in path or "UNION SELECT" in path:
                 path += "?id=1' OR 1=1--"
-            status = random.choice([401, 403, 500, 200])
-            user_agent = random.choice(user_agents[1:])
-            src_ip = random.choice(self.malicious_ips)
+            status = _choice((401, 403, 500, 200))
+            user_agent = _choice(_WEB_ATTACK_USER_AGENTS)
+            src_ip = _choice(_MALICIOUS_IPS)
         else:  # 공격 성공
-            method = random.choice(['GET', 'POST'])
-            path = random.choice(attack_paths)
+            method = _choice(('GET', 'POST'))
+            path = _choice(_WEB_ATTACK_PATHS)
             status = 200
-            user_agent = user_agents[0]
-            src_ip = random.choice(self.malicious_ips)
+            user_agent = _WEB_USER_AGENTS[0]
+            src_ip = _choice(_MALICIOUS_IPS)
         
-        size = random.randint(200, 50000)
+        size = _randint(200, 50000)
         
         return f'{src_ip} - - [{time_str}] "{method} {path} HTTP/1.1" {status} {size} "-" "{user_agent}"'
     
-    def _generate_waf_log(self, timestamp: datetime.datetime, phase: int,
-                         scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_waf_log(self, time_str: str, phase: int,
+                         attack_type: str, index: int, total: int) -> str:
         """WAF 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        attack_types = ['SQL_INJECTION', 'XSS', 'LFI', 'RFI', 'CSRF', 'COMMAND_INJECTION']
-        severity_levels = ['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']
-        
         if phase < 1:  # 정상 요청
-            return f"{time_str} [WAF] INFO: Request processed - SRC: {random.choice(self.external_ips)} - Clean request"
+            return f"{time_str} [WAF] INFO: Request processed - SRC: {_choice(_EXTERNAL_IPS)} - Clean request"
         elif phase < 4:  # 공격 탐지
-            attack = random.choice(attack_types)
-            severity = random.choice(severity_levels[1:])
-            payload = self._generate_attack_payload(attack)
-            src_ip = random.choice(self.malicious_ips)
+            attack_idx = _randrange(len(_WAF_ATTACK_TYPES))
+            attack = _WAF_ATTACK_TYPES[attack_idx]
+            severity = _choice(_WAF_ATTACK_SEVERITIES)
+            payload = _choice(_WAF_ATTACK_PAYLOADS[attack_idx])
+            src_ip = _choice(_MALICIOUS_IPS)
             
             return f'{time_str} [WAF] ALERT {severity}: {attack} detected from {src_ip} - Payload: "{payload}"'
         else:  # 우회된 공격
-            if random.random() < 0.3:  # 30% 확률로 탐지
-                attack = random.choice(attack_types)
+            if _random() < 0.3:  # 30% 확률로 탐지
+                attack = _choice(_WAF_ATTACK_TYPES)
                 severity = 'CRITICAL'
-                src_ip = random.choice(self.malicious_ips)
+                src_ip = _choice(_MALICIOUS_IPS)
                 return f'{time_str} [WAF] ALERT {severity}: {attack} bypass attempt from {src_ip}'
             else:
-                return f"{time_str} [WAF] INFO: Request processed - SRC: {random.choice(self.malicious_ips)} - Bypassed detection"
+                return f"{time_str} [WAF] INFO: Request processed - SRC: {_choice(_MALICIOUS_IPS)} - Bypassed detection"
     
     def _generate_attack_payload(self, attack_type: str) -> str:
         """공격 페이로드 생성"""
         
-        payloads = {
-            'SQL_INJECTION': [
-                "' OR 1=1--", "' UNION SELECT null,null--", "'; DROP TABLE users--",
-                "1' AND (SELECT COUNT(*) FROM information_schema.tables)>0--"
-            ],
-            'XSS': [
-                "<script>alert('XSS')</script>", "<img src=x onerror=alert(1)>",
-                "javascript:alert(document.cookie)"
-            ],
-            'LFI': [
-                "../../../etc/passwd", "..\\..\\..\\windows\\system32\\drivers\\etc\\hosts"
-            ],
-            'COMMAND_INJECTION': [
-                "; cat /etc/passwd", "| whoami", "&& dir C:\\"
-            ]
-        }
-        
-        return random.choice(payloads.get(attack_type, ["malicious_payload"]))
+        return _choice(_ATTACK_PAYLOADS.get(attack_type, _DEFAULT_PAYLOADS))
     
-    def _generate_auth_log(self, timestamp: datetime.datetime, phase: int,
-                          scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_auth_log(self, time_str: str, phase: int,
+                          attack_type: str, index: int, total: int) -> str:
         """인증 시스템 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        events = ['LOGIN_SUCCESS', 'LOGIN_FAILED', 'LOGOUT', 'PASSWORD_CHANGE', 'ACCOUNT_LOCKED']
-        
         if phase < 2:  # 정상 인증
-            user = random.choice(self.user_accounts[:5])  # 정상 사용자
-            event = random.choice(['LOGIN_SUCCESS', 'LOGOUT'])
-            src_ip = random.choice(self.internal_ips)
+            user = _choice(_USER_ACCOUNTS_NORMAL)  # 정상 사용자
+            event = _choice(('LOGIN_SUCCESS', 'LOGOUT'))
+            src_ip = _choice(_INTERNAL_IPS)
         elif phase < 4:  # 공격 시도
-            user = 'admin' if random.random() < 0.7 else random.choice(self.user_accounts)
-            event = 'LOGIN_FAILED' if random.random() < 0.8 else 'ACCOUNT_LOCKED'
-            src_ip = random.choice(self.malicious_ips)
+            user = 'admin' if _random() < 0.7 else _choice(_USER_ACCOUNTS)
+            event = 'LOGIN_FAILED' if _random() < 0.8 else 'ACCOUNT_LOCKED'
+            src_ip = _choice(_MALICIOUS_IPS)
         else:  # 공격 성공
             user = 'admin'
-            event = 'LOGIN_SUCCESS' if random.random() < 0.6 else 'PASSWORD_CHANGE'
-            src_ip = random.choice(self.malicious_ips)
+            event = 'LOGIN_SUCCESS' if _random() < 0.6 else 'PASSWORD_CHANGE'
+            src_ip = _choice(_MALICIOUS_IPS)
         
-        session_id = str(uuid.uuid4())[:8]
+        session_id = os.urandom(4).hex()  # UUID 객체 생성/문자열 변환 없이 같은 형식(16진수 8자리)
         
         return f"{time_str} [AUTH] User: {user} Event: {event} Source: {src_ip} Session: {session_id}"
     
-    def _generate_database_log(self, timestamp: datetime.datetime, phase: int,
-                              scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_database_log(self, time_str: str, phase: int,
+                              attack_type: str, index: int, total: int) -> str:
         """데이터베이스 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        operations = ['SELECT', 'INSERT', 'UPDATE', 'DELETE']
-        tables = ['users', 'products', 'orders', 'customers', 'logs', 'config']
-        
         if phase < 3:  # 정상 DB 접근
-            operation = random.choice(['SELECT', 'INSERT', 'UPDATE'])
-            table = random.choice(tables[:4])
-            user = random.choice(['webapp', 'service', 'admin'])
-            rows = random.randint(1, 100)
+            operation = _choice(('SELECT', 'INSERT', 'UPDATE'))
+            table = _choice(_DB_NORMAL_TABLES)
+            user = _choice(('webapp', 'service', 'admin'))
+            rows = _randint(1, 100)
         elif phase < 5:  # 공격 시도
             operation = 'SELECT'
-            table = random.choice(['users', 'customers', 'admin_config'])
+            table = _choice(('users', 'customers', 'admin_config'))
             user = 'admin'
-            rows = random.randint(100, 10000)
+            rows = _randint(100, 10000)
         else:  # 데이터 유출
             operation = 'SELECT'
-            table = random.choice(['customers', 'credit_cards', 'personal_info'])
+            table = _choice(('customers', 'credit_cards', 'personal_info'))
             user = 'admin'
-            rows = random.randint(1000, 50000)
+            rows = _randint(1000, 50000)
         
-        duration = random.uniform(0.1, 5.0)
+        duration = _uniform(0.1, 5.0)
         
         return f"{time_str} [DB] User: {user} Operation: {operation} Table: {table} Rows: {rows} Duration: {duration:.2f}s"
     
-    def _generate_proxy_log(self, timestamp: datetime.datetime, phase: int,
-                           scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_proxy_log(self, time_str: str, phase: int,
+                           attack_type: str, index: int, total: int) -> str:
         """프록시 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
         if phase < 2:  # 정상 트래픽
-            domain = random.choice(self.normal_domains)
+            domain = _choice(_NORMAL_DOMAINS)
             method = 'GET'
             status = 200
         elif phase < 4:  # 의심스러운 통신
-            domain = random.choice(self.malicious_domains)
-            method = random.choice(['GET', 'POST'])
-            status = random.choice([200, 403, 404])
+            domain = _choice(_MALICIOUS_DOMAINS)
+            method = _choice(('GET', 'POST'))
+            status = _choice((200, 403, 404))
         else:  # 데이터 유출
             domain = 'external-server.com'
             method = 'POST'
             status = 200
         
-        src_ip = random.choice(self.internal_ips)
-        size = random.randint(1024, 1048576)
+        src_ip = _choice(_INTERNAL_IPS)
+        size = _randint(1024, 1048576)
         
         return f"{time_str} [PROXY] {method} https://{domain}/ - Client: {src_ip} Status: {status} Size: {size}"
     
-    def _generate_email_log(self, timestamp: datetime.datetime, phase: int,
-                           scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_email_log(self, time_str: str, phase: int,
+                           attack_type: str, index: int, total: int) -> str:
         """이메일 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        internal_emails = ['user@company.com', 'admin@company.com', 'support@company.com']
-        external_emails = ['contact@partner.com', 'info@supplier.com']
-        malicious_emails = ['attacker@evil.com', 'phishing@fake-bank.com']
-        
-        subjects = ['Meeting Schedule', 'Project Update', 'Important Document', 'Urgent Action Required']
-        malicious_subjects = ['Account Verification Required', 'Security Alert', 'Invoice #12345']
-        
         if phase == 0:  # 초기 피싱
-            from_addr = random.choice(malicious_emails)
-            to_addr = random.choice(internal_emails)
-            subject = random.choice(malicious_subjects)
-            attachment = 'invoice.doc' if random.random() < 0.5 else None
+            from_addr = _choice(_MALICIOUS_EMAILS)
+            to_addr = _choice(_INTERNAL_EMAILS)
+            subject = _choice(_EMAIL_MALICIOUS_SUBJECTS)
+            attachment = 'invoice.doc' if _random() < 0.5 else None
         elif phase < 3:  # 정상 이메일
-            from_addr = random.choice(internal_emails + external_emails)
-            to_addr = random.choice(internal_emails)
-            subject = random.choice(subjects)
+            from_addr = _choice(_EMAIL_SENDERS_ALL)
+            to_addr = _choice(_INTERNAL_EMAILS)
+            subject = _choice(_EMAIL_SUBJECTS)
             attachment = None
         else:  # 데이터 유출
-            from_addr = random.choice(internal_emails)
+            from_addr = _choice(_INTERNAL_EMAILS)
             to_addr = 'external@gmail.com'
             subject = 'Confidential Data'
             attachment = 'customer_data.zip'
         
-        size = random.randint(1024, 10485760)
+        size = _randint(1024, 10485760)
         attachment_str = f" ATTACHMENT: {attachment}" if attachment else ""
         
         return f"{time_str} [EMAIL] FROM: {from_addr} TO: {to_addr} SUBJECT: \"{subject}\" SIZE: {size}{attachment_str}"
     
-    def _generate_endpoint_log(self, timestamp: datetime.datetime, phase: int,
-                              scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_endpoint_log(self, time_str: str, phase: int,
+                              attack_type: str, index: int, total: int) -> str:
         """엔드포인트 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        normal_processes = ['chrome.exe', 'notepad.exe', 'outlook.exe', 'excel.exe']
-        malicious_processes = ['malware.exe', 'backdoor.exe', 'keylogger.exe', 'ransomware.exe']
-        
-        events = ['PROCESS_START', 'PROCESS_STOP', 'FILE_WRITE', 'REGISTRY_MODIFY', 'NETWORK_CONNECT']
-        
         if phase < 1:  # 정상 활동
-            process = random.choice(normal_processes)
-            event = random.choice(events[:2])
+            process = _choice(_EP_NORMAL_PROCESSES)
+            event = _choice(_EP_EVENTS_START_STOP)
             path = 'C:\\Program Files\\Application\\'
         elif phase < 3:  # 멀웨어 실행
-            process = random.choice(malicious_processes)
-            event = random.choice(events)
+            process = _choice(_EP_MALICIOUS_PROCESSES)
+            event = _choice(_EP_EVENTS)
             path = 'C:\\Users\\user\\AppData\\Temp\\'
         else:  # 지속적인 악성 활동
-            process = random.choice(malicious_processes)
-            event = random.choice(events[2:])  # 파일/레지스트리 변경
+            process = _choice(_EP_MALICIOUS_PROCESSES)
+            event = _choice(_EP_EVENTS_FILE_REG_NET)  # 파일/레지스트리 변경
             path = 'C:\\Windows\\System32\\'
         
-        user = random.choice(self.user_accounts[:3])
+        user = _choice(_USER_ACCOUNTS_FIRST3)
         
         return f"{time_str} [ENDPOINT] Process: {process} Event: {event} User: {user} Path: {path}"
     
-    def _generate_dns_log(self, timestamp: datetime.datetime, phase: int,
-                         scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_dns_log(self, time_str: str, phase: int,
+                         attack_type: str, index: int, total: int) -> str:
         """DNS 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        query_types = ['A', 'AAAA', 'MX', 'TXT', 'CNAME']
-        
         if phase < 2:  # 정상 DNS 질의
-            domain = random.choice(self.normal_domains)
-            query_type = random.choice(['A', 'AAAA'])
+            domain = _choice(_NORMAL_DOMAINS)
+            query_type = _choice(('A', 'AAAA'))
         elif phase < 4:  # 악성 도메인 질의
-            domain = random.choice(self.malicious_domains)
+            domain = _choice(_MALICIOUS_DOMAINS)
             query_type = 'A'
         else:  # C&C 통신
-            domain = f"c2-{random.randint(1000, 9999)}.evil.com"
-            query_type = random.choice(['A', 'TXT'])
+            domain = f"c2-{_randint(1000, 9999)}.evil.com"
+            query_type = _choice(('A', 'TXT'))
         
-        client_ip = random.choice(self.internal_ips)
-        response_ip = random.choice(self.external_ips)
+        client_ip = _choice(_INTERNAL_IPS)
+        response_ip = _choice(_EXTERNAL_IPS)
         
         return f"{time_str} [DNS] Query: {domain} Type: {query_type} Client: {client_ip} Response: {response_ip}"
     
-    def _generate_network_log(self, timestamp: datetime.datetime, phase: int,
-                             scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_network_log(self, time_str: str, phase: int,
+                             attack_type: str, index: int, total: int) -> str:
         """네트워크 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        # 정상 트래픽 -> 네트워크 스캔 -> 횡적 이동 순으로 목적지 포트 풀만 달라짐
+        src_ip = _choice(_INTERNAL_IPS)
+        dst_ip = _choice(_INTERNAL_IPS)
+        protocol = 'TCP'
+        port = _choice(_NET_PHASE_PORTS[phase if phase < 4 else 4])
         
-        protocols = ['TCP', 'UDP', 'ICMP']
-        ports = [80, 443, 22, 3389, 445, 135, 1433, 3306]
+        bytes_sent = _randint(64, 65536)
         
-        if phase < 2:  # 정상 트래픽
-            src_ip = random.choice(self.internal_ips)
-            dst_ip = random.choice(self.internal_ips)
-            protocol = 'TCP'
-            port = random.choice([80, 443, 22])
-        elif phase < 4:  # 네트워크 스캔
-            src_ip = random.choice(self.internal_ips)
-            dst_ip = random.choice(self.internal_ips)
-            protocol = 'TCP'
-            port = random.choice(ports)
-        else:  # 횡적 이동
-            src_ip = random.choice(self.internal_ips)
-            dst_ip = random.choice(self.internal_ips)
-            protocol = 'TCP'
-            port = random.choice([445, 135, 3389])  # SMB, RPC, RDP
-        
-        bytes_sent = random.randint(64, 65536)
-        
-        return f"{time_str} [NETWORK] SRC: {src_ip}:{random.randint(1024, 65535)} DST: {dst_ip}:{port} PROTO: {protocol} BYTES: {bytes_sent}"
+        return f"{time_str} [NETWORK] SRC: {src_ip}:{_randint(1024, 65535)} DST: {dst_ip}:{port} PROTO: {protocol} BYTES: {bytes_sent}"
     
-    def _generate_fileserver_log(self, timestamp: datetime.datetime, phase: int,
-                                scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_fileserver_log(self, time_str: str, phase: int,
+                                attack_type: str, index: int, total: int) -> str:
         """파일서버 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        operations = ['READ', 'write', 'delete', 'copy', 'move']
-        file_types = ['document.pdf', 'report.xlsx', 'customer_data.csv', 'config.txt', 'backup.zip']
-        
         if phase < 2:  # 정상 파일 접근
-            operation = random.choice(['read', 'write'])
-            file_name = random.choice(file_types[:3])
-            user = random.choice(self.user_accounts[:3])
+            operation = _choice(('read', 'write'))
+            file_name = _choice(_FS_NORMAL_FILES)
+            user = _choice(_USER_ACCOUNTS_FIRST3)
         elif phase < 4:  # 의심스러운 접근
             operation = 'read'
             file_name = 'customer_data.csv'
             user = 'admin'
         else:  # 대량 파일 복사
-            operation = random.choice(['copy', 'read'])
-            file_name = random.choice(['customer_data.csv', 'financial_reports.xlsx'])
+            operation = _choice(('copy', 'read'))
+            file_name = _choice(('customer_data.csv', 'financial_reports.xlsx'))
             user = 'admin'
         
-        file_size = random.randint(1024, 104857600)
+        file_size = _randint(1024, 104857600)
         
         return f"{time_str} [FILESERVER] User: {user} Operation: {operation} File: /data/{file_name} Size: {file_size}"
     
-    def _generate_usb_log(self, timestamp: datetime.datetime, phase: int,
-                         scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_usb_log(self, time_str: str, phase: int,
+                         attack_type: str, index: int, total: int) -> str:
         """USB 모니터링 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        events = ['USB_CONNECT', 'USB_DISCONNECT', 'FILE_COPY_TO_USB', 'FILE_COPY_FROM_USB']
-        device_ids = ['USB_DEVICE_001', 'USB_DEVICE_002', 'USB_DEVICE_003']
-        
         if phase < 3:  # 정상 USB 사용
-            event = random.choice(['USB_CONNECT', 'USB_DISCONNECT'])
-            device = random.choice(device_ids)
-            user = random.choice(self.user_accounts[:3])
+            event = _choice(('USB_CONNECT', 'USB_DISCONNECT'))
+            device = _choice(_USB_DEVICE_IDS)
+            user = _choice(_USER_ACCOUNTS_FIRST3)
             file_info = ""
         else:  # 데이터 유출
             event = 'FILE_COPY_TO_USB'
             device = 'USB_DEVICE_001'
             user = 'admin'
-            file_info = f" FILE: customer_data.csv SIZE: {random.randint(1048576, 104857600)}"
+            file_info = f" FILE: customer_data.csv SIZE: {_randint(1048576, 104857600)}"
         
         return f"{time_str} [USB] Device: {device} Event: {event} User: {user}{file_info}"
     
-    def _generate_dlp_log(self, timestamp: datetime.datetime, phase: int,
-                         scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_dlp_log(self, time_str: str, phase: int,
+                         attack_type: str, index: int, total: int) -> str:
         """DLP 시스템 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        actions = ['ALLOW', 'BLOCK', 'WARN', 'QUARANTINE']
-        channels = ['EMAIL', 'USB', 'WEB', 'PRINT', 'CLOUD_UPLOAD']
-        policies = ['PII_PROTECTION', 'CREDIT_CARD_DATA', 'CONFIDENTIAL_DOCS', 'FINANCIAL_DATA']
-        
         if phase < 3:  # 정상 활동
             action = 'ALLOW'
-            channel = random.choice(channels[:3])
-            policy = random.choice(policies)
-            user = random.choice(self.user_accounts[:3])
+            channel = _choice(_DLP_CHANNELS_NORMAL)
+            policy = _choice(_DLP_POLICIES)
+            user = _choice(_USER_ACCOUNTS_FIRST3)
         else:  # 정책 위반 탐지
-            action = random.choice(['BLOCK', 'WARN'])
-            channel = random.choice(['EMAIL', 'USB'])
+            action = _choice(('BLOCK', 'WARN'))
+            channel = _choice(('EMAIL', 'USB'))
             policy = 'PII_PROTECTION'
             user = 'admin'
         
-        confidence = random.randint(70, 99)
+        confidence = _randint(70, 99)
         
         return f"{time_str} [DLP] Action: {action} Channel: {channel} Policy: {policy} User: {user} Confidence: {confidence}%"
     
-    def _generate_router_log(self, timestamp: datetime.datetime, phase: int,
-                            scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_router_log(self, time_str: str, phase: int,
+                            attack_type: str, index: int, total: int) -> str:
         """라우터 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        interfaces = ['eth0', 'eth1', 'wan0', 'lan0']
-        events = ['LINK_UP', 'LINK_DOWN', 'ROUTING_UPDATE', 'BANDWIDTH_EXCEEDED', 'PACKET_DROP']
-        
         if phase < 2:  # 정상 라우터 동작
-            interface = random.choice(interfaces)
-            event = random.choice(['LINK_UP', 'ROUTING_UPDATE'])
-            bandwidth = random.randint(10, 100)
+            interface = _choice(_ROUTER_INTERFACES)
+            event = _choice(('LINK_UP', 'ROUTING_UPDATE'))
+            bandwidth = _randint(10, 100)
         elif phase < 4:  # 트래픽 증가
             interface = 'wan0'
             event = 'BANDWIDTH_EXCEEDED'
-            bandwidth = random.randint(800, 1000)
+            bandwidth = _randint(800, 1000)
         else:  # DDoS 공격 중
             interface = 'wan0'
-            event = random.choice(['BANDWIDTH_EXCEEDED', 'PACKET_DROP'])
-            bandwidth = random.randint(900, 1000)
+            event = _choice(('BANDWIDTH_EXCEEDED', 'PACKET_DROP'))
+            bandwidth = _randint(900, 1000)
         
         return f"{time_str} [ROUTER] Interface: {interface} Event: {event} Bandwidth: {bandwidth}Mbps"
     
-    def _generate_loadbalancer_log(self, timestamp: datetime.datetime, phase: int,
-                                  scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_loadbalancer_log(self, time_str: str, phase: int,
+                                  attack_type: str, index: int, total: int) -> str:
         """로드밸런서 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        servers = ['web01', 'web02', 'web03', 'web04']
-        status_types = ['HEALTHY', 'UNHEALTHY', 'OVERLOADED', 'TIMEOUT']
-        
         if phase < 2:  # 정상 상태
-            server = random.choice(servers)
+            server = _choice(_LB_SERVERS)
             status = 'HEALTHY'
-            connections = random.randint(50, 200)
-            response_time = random.randint(50, 300)
+            connections = _randint(50, 200)
+            response_time = _randint(50, 300)
         elif phase < 4:  # 부하 증가
-            server = random.choice(servers)
-            status = random.choice(['HEALTHY', 'OVERLOADED'])
-            connections = random.randint(500, 2000)
-            response_time = random.randint(300, 1000)
+            server = _choice(_LB_SERVERS)
+            status = _choice(('HEALTHY', 'OVERLOADED'))
+            connections = _randint(500, 2000)
+            response_time = _randint(300, 1000)
         else:  # 서버 과부하
-            server = random.choice(servers)
-            status = random.choice(['OVERLOADED', 'TIMEOUT', 'UNHEALTHY'])
-            connections = random.randint(2000, 10000)
-            response_time = random.randint(1000, 5000)
+            server = _choice(_LB_SERVERS)
+            status = _choice(('OVERLOADED', 'TIMEOUT', 'UNHEALTHY'))
+            connections = _randint(2000, 10000)
+            response_time = _randint(1000, 5000)
         
         return f"{time_str} [LB] Server: {server} Status: {status} Connections: {connections} Response_Time: {response_time}ms"
     
-    def _generate_cdn_log(self, timestamp: datetime.datetime, phase: int,
-                         scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_cdn_log(self, time_str: str, phase: int,
+                         attack_type: str, index: int, total: int) -> str:
         """CDN 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        edges = ['edge01.cdn.com', 'edge02.cdn.com', 'edge03.cdn.com']
-        resources = ['/css/style.css', '/js/app.js', '/images/logo.png', '/api/data', '/index.html']
-        
         if phase < 2:  # 정상 CDN 동작
-            edge = random.choice(edges)
-            resource = random.choice(resources)
+            edge = _choice(_CDN_EDGES)
+            resource = _choice(_CDN_RESOURCES)
             status = 200
-            cache = random.choice(['HIT', 'MISS'])
+            cache = _choice(('HIT', 'MISS'))
         elif phase < 4:  # 트래픽 증가
-            edge = random.choice(edges)
-            resource = random.choice(resources)
-            status = 200 if random.random() < 0.8 else 503
-            cache = 'HIT' if random.random() < 0.6 else 'MISS'
+            edge = _choice(_CDN_EDGES)
+            resource = _choice(_CDN_RESOURCES)
+            status = 200 if _random() < 0.8 else 503
+            cache = 'HIT' if _random() < 0.6 else 'MISS'
         else:  # 서비스 장애
-            edge = random.choice(edges)
-            resource = random.choice(resources)
-            status = 503 if random.random() < 0.7 else 200
+            edge = _choice(_CDN_EDGES)
+            resource = _choice(_CDN_RESOURCES)
+            status = 503 if _random() < 0.7 else 200
             cache = 'MISS'
         
-        size = random.randint(1024, 1048576)
+        size = _randint(1024, 1048576)
         
         return f"{time_str} [CDN] Edge: {edge} Resource: {resource} Status: {status} Cache: {cache} Size: {size}"
     
-    def _generate_backup_log(self, timestamp: datetime.datetime, phase: int,
-                            scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_backup_log(self, time_str: str, phase: int,
+                            attack_type: str, index: int, total: int) -> str:
         """백업 시스템 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        
-        operations = ['BACKUP_START', 'BACKUP_COMPLETE', 'BACKUP_FAILED', 'RESTORE_START', 'BACKUP_DELETE']
-        backup_types = ['FULL', 'INCREMENTAL', 'DIFFERENTIAL']
-        
         if phase < 3:  # 정상 백업
-            operation = random.choice(['BACKUP_START', 'BACKUP_COMPLETE'])
-            backup_type = random.choice(backup_types)
-            size = random.randint(1073741824, 107374182400)  # 1GB - 100GB
+            operation = _choice(('BACKUP_START', 'BACKUP_COMPLETE'))
+            backup_type = _choice(_BACKUP_TYPES)
+            size = _randint(1073741824, 107374182400)  # 1GB - 100GB
             status = 'SUCCESS'
         else:  # 백업 시스템 공격
-            operation = random.choice(['BACKUP_DELETE', 'BACKUP_FAILED'])
+            operation = _choice(('BACKUP_DELETE', 'BACKUP_FAILED'))
             backup_type = 'FULL'
-            size = random.randint(1073741824, 107374182400)
+            size = _randint(1073741824, 107374182400)
             status = 'FAILED' if operation == 'BACKUP_FAILED' else 'DELETED'
         
         return f"{time_str} [BACKUP] Operation: {operation} Type: {backup_type} Size: {size} Status: {status}"
     
-    def _generate_generic_log(self, timestamp: datetime.datetime, phase: int,
-                             scenario: Dict[str, Any], index: int, total: int) -> str:
+    def _generate_generic_log(self, time_str: str, phase: int,
+                             attack_type: str, index: int, total: int) -> str:
         """일반 로그 생성"""
         
-        time_str = timestamp.strftime('%Y-%m-%d %H:%M:%S')
-        return f"{time_str} [SYSTEM] Generic log entry {index + 1} - Phase: {phase} - {scenario.get('attack_type', 'unknown')}"
\ No newline at end of file
+        return f"{time_str} [SYSTEM] Generic log entry {index + 1} - Phase: {phase} - {attack_type}"
\ No newline at end of file
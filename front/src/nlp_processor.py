@@ -4,34 +4,32 @@ OpenAI GPT를 사용하여 사용자 입력을 분석하고 시나리오를 구
 """
 
 import openai
+import asyncio
 import json
-import re
+import os
 import uuid  # id 생성을 위해 추가
-from typing import Dict, List, Any
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
 
-class NLPProcessor:
-    def __init__(self, api_key: str):
-        """
-        NLP 프로세서 초기화
-        
-        Args:
-            api_key (str): OpenAI API 키
-        """
-        self.client = openai.OpenAI(api_key=api_key)
-        
-    def process_scenario(self, user_input: str) -> Dict[str, Any]:
-        """
-        사용자 입력을 분석하여 구체적인 시나리오 생성
-        
-        Args:
-            user_input (str): 사용자가 입력한 자연어 시나리오
-            
-        Returns:
-            Dict[str, Any]: 구체화된 시나리오 정보
-        """
-        
-        # 시스템 프롬프트에 difficulty 필드 추가
-        system_prompt = """
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 더 빠른 직렬화 사용
+except ImportError:
+    orjson = None
+
+from .openai_clients import get_async_client, get_client, get_semaphore, with_retries
+
+# orjson.JSONDecodeError 는 json.JSONDecodeError 의 하위 클래스라 기존 except 절이 그대로 동작
+_loads = orjson.loads if orjson is not None else json.loads
+
+def _dumps_pretty(obj: Any) -> str:
+    """프롬프트에 넣을 들여쓰기 JSON 문자열 (한글은 이스케이프하지 않음)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+# 시스템 프롬프트 (호출마다 같은 바이트열이 앞에 오도록 모듈 상수로 고정 → 서버 측 프롬프트 캐시 적중)
+# 시나리오 프롬프트에는 difficulty 필드 포함
+_SYSTEM_PROMPT_SCENARIO = """
 당신은 사이버 보안 전문가입니다. 사용자가 입력한 자연어 시나리오를 분석하여 구체적인 보안 시나리오를 생성해주세요.
 
 다음 JSON 형태로 응답해주세요:
@@ -52,43 +50,251 @@ class NLPProcessor:
 시나리오의 복잡성과 전문성에 따라 난이도를 '초급', '중급', '고급'으로 분류해주세요.
 타임라인은 실제 공격 흐름에 맞게 6-10단계로 구성해주세요.
 """
+
+_SYSTEM_PROMPT_ENHANCE = "기존 시나리오를 사용자 피드백에 따라 수정하고 보완해주세요. 동일한 JSON 형태로 응답하되, 사용자가 요청한 변경사항을 반영해주세요."
+
+_ATTACK_TYPES = ("web_attack", "malware", "insider_threat", "ddos", "apt", "ransomware")
+_DIFFICULTY_LEVELS = ("초급", "중급", "고급")
+
+# Structured Outputs(strict) 스키마: 필드 누락/enum 밖의 값은 서버에서 막힌다
+_SCENARIO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "attack_type": {"type": "string", "enum": list(_ATTACK_TYPES)},
+        "difficulty": {"type": "string", "enum": list(_DIFFICULTY_LEVELS)},
+        "timeline": {"type": "array", "items": {"type": "string"}},
+        "log_types": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"name": {"type": "string"}, "type": {"type": "string"}, "description": {"type": "string"}},
+                "required": ["name", "type", "description"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["title", "description", "attack_type", "difficulty", "timeline", "log_types"],
+    "additionalProperties": False
+}
+_SCENARIO_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {"name": "scenario", "schema": _SCENARIO_SCHEMA, "strict": True}
+}
+
+# 공격 유형별 기본 로그 타입 (import 시 한 번만 생성, 반환 시에는 dict 로 복사)
+_DEFAULT_LOG_TYPES = MappingProxyType({
+    "web_attack": (MappingProxyType({"name": "웹서버", "type": "webserver", "description": "HTTP 요청 로그"}),),
+    "malware": (MappingProxyType({"name": "엔드포인트", "type": "endpoint", "description": "프로세스 실행 로그"}),),
+    "insider_threat": (MappingProxyType({"name": "파일서버", "type": "fileserver", "description": "파일 접근 로그"}),),
+    "ddos": (MappingProxyType({"name": "방화벽", "type": "firewall", "description": "대량 트래픽 로그"}),),
+    "apt": (MappingProxyType({"name": "네트워크", "type": "network", "description": "내부 통신 로그"}),),
+    "ransomware": (MappingProxyType({"name": "엔드포인트", "type": "endpoint", "description": "파일 암호화 로그"}),)
+})
+
+class NLPProcessor:
+    def __init__(self, api_key: str, client: Optional[openai.OpenAI] = None):
+        """
+        NLP 프로세서 초기화
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"다음 시나리오를 분석하고 구체화해주세요:\n\n{user_input}"}
-                ],
-                temperature=0.7,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
+        Args:
+            api_key (str): OpenAI API 키
+            client (openai.OpenAI, optional): 재사용할 클라이언트 (없으면 프로세스 공유 커넥션 풀을 쓰는 클라이언트)
+        """
+        self.api_key = api_key
+        self.client = with_retries(client) if client is not None else get_client(api_key)
+        # 시나리오 분석은 작은 모델부터 시도하고, 응답이 스키마를 못 맞추면 큰 모델로 올린다
+        self.models = tuple(dict.fromkeys((
+            os.getenv("NLP_FAST_MODEL", "gpt-4o-mini"),
+            os.getenv("NLP_STRONG_MODEL", "gpt-4o"),
+        )))
+        
+    def process_scenario(self, user_input: str) -> Dict[str, Any]:
+        """
+        사용자 입력을 분석하여 구체적인 시나리오 생성
+        
+        Args:
+            user_input (str): 사용자가 입력한 자연어 시나리오
             
-            content = response.choices[0].message.content
-            scenario = json.loads(content)
+        Returns:
+            Dict[str, Any]: 구체화된 시나리오 정보
+        """
+        
+        try:
+            for model in self.models:
+                response = self.client.chat.completions.create(**self._scenario_request(user_input, model))
+                scenario = self._route_result(model, response.choices[0].message.content)
+                if scenario is not None:
+                    return scenario
             
-            # 생성된 시나리오에 고유 ID 부여
-            scenario['id'] = str(uuid.uuid4())
-            scenario = self._validate_and_enhance_scenario(scenario)
+        except Exception as e:
+            raise Exception(f"시나리오 분석 실패: {str(e)}")
+    
+    async def aprocess_scenario(self, user_input: str) -> Dict[str, Any]:
+        """
+        process_scenario의 비동기 버전 (세마포어로 동시 호출 수 제한)
+        
+        Args:
+            user_input (str): 사용자가 입력한 자연어 시나리오
             
-            return scenario
+        Returns:
+            Dict[str, Any]: 구체화된 시나리오 정보
+        """
+        
+        try:
+            for model in self.models:
+                async with get_semaphore():
+                    response = await get_async_client(self.api_key).chat.completions.create(
+                        **self._scenario_request(user_input, model)
+                    )
+                scenario = self._route_result(model, response.choices[0].message.content)
+                if scenario is not None:
+                    return scenario
             
         except Exception as e:
             raise Exception(f"시나리오 분석 실패: {str(e)}")
     
-    def _validate_and_enhance_scenario(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
-        """시나리오 검증 및 보완 (difficulty 기본값 추가)"""
+    async def aprocess_scenarios(self, user_inputs: List[str]) -> List[Dict[str, Any]]:
+        """
+        여러 시나리오를 동시에 분석 (전체 소요 시간 ≈ 가장 느린 단일 호출)
         
-        defaults = {
-            "title": "사용자 정의 시나리오", "description": "사용자가 입력한 보안 시나리오",
-            "attack_type": "web_attack", "difficulty": "중급",
-            "timeline": ["공격 준비", "초기 침입", "내부 활동", "목표 달성", "흔적 제거"],
-            "log_types": []
-        }
+        Args:
+            user_inputs (List[str]): 자연어 시나리오 목록
+            
+        Returns:
+            List[Dict[str, Any]]: 입력 순서대로 정렬된 시나리오 목록
+        """
+        
+        return await asyncio.gather(*(self.aprocess_scenario(x) for x in user_inputs))
+    
+    def submit_batch(self, user_inputs: List[str]) -> Tuple[str, List[str]]:
+        """
+        여러 시나리오 분석을 Batch API로 제출 (즉시 결과가 필요 없는 대량 생성용, 비용 50% 절감)
+        
+        Args:
+            user_inputs (List[str]): 자연어 시나리오 목록
+            
+        Returns:
+            Tuple[str, List[str]]: (배치 ID, 입력 순서와 같은 custom_id 목록)
+        """
+        
+        custom_ids = [str(uuid.uuid4()) for _ in user_inputs]
+        lines = [
+            json.dumps({
+                "custom_id": custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                # 배치는 결과를 보고 재시도할 수 없으므로 처음부터 큰 모델 사용
+                "body": self._scenario_request(user_input, self.models[-1]),
+            }, ensure_ascii=False)
+            for custom_id, user_input in zip(custom_ids, user_inputs)
+        ]
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("scenarios.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            raise Exception(f"배치 제출 실패: {str(e)}")
+        
+        return batch.id, custom_ids
+    
+    def poll_batch(self, batch_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        제출한 배치의 결과 조회
+        
+        Args:
+            batch_id (str): submit_batch가 반환한 배치 ID
+            
+        Returns:
+            Optional[Dict[str, Dict[str, Any]]]: custom_id별 시나리오 (아직 진행 중이면 None, 실패한 요청은 제외)
+        """
+        
+        try:
+            batch = self.client.batches.retrieve(batch_id)
+        except Exception as e:
+            raise Exception(f"배치 조회 실패: {str(e)}")
+        
+        if batch.status in ("failed", "expired", "cancelled"):
+            raise Exception(f"배치 처리 실패: {batch.status}")
+        if batch.status != "completed" or not batch.output_file_id:
+            return None
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        for line in self.client.files.content(batch.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = _loads(line)
+            response = item.get("response") or {}
+            if item.get("error") or response.get("status_code") != 200:
+                continue
+            try:
+                results[item["custom_id"]] = self._parse_scenario(
+                    response["body"]["choices"][0]["message"]["content"]
+                )
+            except (KeyError, IndexError, TypeError, json.JSONDecodeError):
+                continue
+        return results
+    
+    def _scenario_request(self, user_input: str, model: str) -> Dict[str, Any]:
+        """process_scenario 계열 공통 chat.completions.create 인자"""
+        
+        return dict(
+            model=model,
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT_SCENARIO},
+                {"role": "user", "content": f"다음 시나리오를 분석하고 구체화해주세요:\n\n{user_input}"}
+            ],
+            temperature=0.7,
+            max_tokens=2000,
+            response_format=_SCENARIO_RESPONSE_FORMAT
+        )
+    
+    def _route_result(self, model: str, content: str) -> Optional[Dict[str, Any]]:
+        """
+        모델 응답을 채택할지 결정 (스키마를 만족하거나 마지막 모델이면 채택)
+        
+        Args:
+            model (str): 응답을 만든 모델
+            content (str): 모델 응답 본문(JSON)
+            
+        Returns:
+            Optional[Dict[str, Any]]: 채택된 시나리오 (다음 모델로 넘어가야 하면 None)
+        """
         
-        for key, default_value in defaults.items():
-            scenario.setdefault(key, default_value)
+        # temperature 0.7 생성이라 프로세스 전역 캐시는 두지 않음 (같은 입력 재분석은 main 의 세션 캐시가 막음)
+        raw = _loads(content)
+        if not self._schema_ok(raw) and model != self.models[-1]:
+            return None
+        raw['id'] = str(uuid.uuid4())
+        return self._validate_and_enhance_scenario(raw)
+    
+    def _schema_ok(self, scenario: Dict[str, Any]) -> bool:
+        """
+        스키마로 보장되지 않는 품질 조건 검사 (필드/enum 은 strict 스키마가 보장)
+        타임라인 6단계 이상, 로그 타입 1개 이상
+        """
+        
+        return len(scenario["timeline"]) >= 6 and len(scenario["log_types"]) > 0
+    
+    def _parse_scenario(self, content: str) -> Dict[str, Any]:
+        """모델 응답(JSON)을 시나리오로 변환하고 고유 ID 부여"""
+        
+        scenario = _loads(content)
+        
+        # 생성된 시나리오에 고유 ID 부여
+        scenario['id'] = str(uuid.uuid4())
+        return self._validate_and_enhance_scenario(scenario)
+    
+    def _validate_and_enhance_scenario(self, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """시나리오 보완 (필드 존재는 응답 스키마가 보장하므로 빈 log_types 만 기본값으로 채움)"""
         
         if not scenario["log_types"]:
             scenario["log_types"] = self._get_default_log_types(scenario["attack_type"])
@@ -97,35 +303,44 @@ class NLPProcessor:
     
     def _get_default_log_types(self, attack_type: str) -> List[Dict[str, str]]:
         """공격 유형별 기본 로그 타입 반환"""
-        # (기존 코드와 동일)
-        default_logs = {
-            "web_attack": [{"name": "웹서버", "type": "webserver", "description": "HTTP 요청 로그"}],
-            "malware": [{"name": "엔드포인트", "type": "endpoint", "description": "프로세스 실행 로그"}],
-            "insider_threat": [{"name": "파일서버", "type": "fileserver", "description": "파일 접근 로그"}],
-            "ddos": [{"name": "방화벽", "type": "firewall", "description": "대량 트래픽 로그"}],
-            "apt": [{"name": "네트워크", "type": "network", "description": "내부 통신 로그"}],
-            "ransomware": [{"name": "엔드포인트", "type": "endpoint", "description": "파일 암호화 로그"}]
-        }
-        return default_logs.get(attack_type, default_logs["web_attack"])
+        return [dict(x) for x in _DEFAULT_LOG_TYPES.get(attack_type, _DEFAULT_LOG_TYPES["web_attack"])]
     
     def enhance_scenario_details(self, scenario: Dict[str, Any], user_feedback: str) -> Dict[str, Any]:
         """사용자 피드백을 바탕으로 시나리오 세부사항 보완"""
         # (기존 코드와 동일)
-        system_prompt = "기존 시나리오를 사용자 피드백에 따라 수정하고 보완해주세요. 동일한 JSON 형태로 응답하되, 사용자가 요청한 변경사항을 반영해주세요."
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"기존 시나리오:\n{json.dumps(scenario, ensure_ascii=False, indent=2)}\n\n사용자 피드백:\n{user_feedback}"}
-                ],
-                temperature=0.7,
-                max_tokens=2000,
-                response_format={"type": "json_object"}
-            )
-            content = response.choices[0].message.content
-            enhanced_scenario = json.loads(content)
-            return self._validate_and_enhance_scenario(enhanced_scenario)
+            response = self.client.chat.completions.create(**self._enhance_request(scenario, user_feedback))
+            return self._parse_enhanced(scenario, response.choices[0].message.content)
         except Exception as e:
             raise Exception(f"시나리오 보완 실패: {str(e)}")
-
+    
+    async def aenhance_scenario_details(self, scenario: Dict[str, Any], user_feedback: str) -> Dict[str, Any]:
+        """enhance_scenario_details의 비동기 버전"""
+        try:
+            async with get_semaphore():
+                response = await get_async_client(self.api_key).chat.completions.create(
+                    **self._enhance_request(scenario, user_feedback)
+                )
+            return self._parse_enhanced(scenario, response.choices[0].message.content)
+        except Exception as e:
+            raise Exception(f"시나리오 보완 실패: {str(e)}")
+    
+    def _parse_enhanced(self, scenario: Dict[str, Any], content: str) -> Dict[str, Any]:
+        """보완된 시나리오 응답 파싱 (스키마 응답에는 id 가 없으므로 원래 ID 유지)"""
+        enhanced = _loads(content)
+        if 'id' in scenario:
+            enhanced['id'] = scenario['id']
+        return self._validate_and_enhance_scenario(enhanced)
+    
+    def _enhance_request(self, scenario: Dict[str, Any], user_feedback: str) -> Dict[str, Any]:
+        """enhance_scenario_details 계열 공통 chat.completions.create 인자"""
+        return dict(
+            model=self.models[-1],  # 보완은 결과를 보고 모델을 올릴 수 없으므로 큰 모델 사용
+            messages=[
+                {"role": "system", "content": _SYSTEM_PROMPT_ENHANCE},
+                {"role": "user", "content": f"기존 시나리오:\n{_dumps_pretty(scenario)}\n\n사용자 피드백:\n{user_feedback}"}
+            ],
+            temperature=0.7,
+            max_tokens=2000,
+            response_format=_SCENARIO_RESPONSE_FORMAT
+        )
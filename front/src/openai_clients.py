@@ -0,0 +1,104 @@
+"""
+OpenAI 클라이언트 공용 모듈
+- 동기 클라이언트는 프로세스 전역 httpx.Client 하나를 공유해 TCP/TLS 연결을 재사용
+- 비동기 클라이언트와 동시 호출 제한용 세마포어는 이벤트 루프마다 하나씩 관리
+- h2 패키지가 설치되어 있으면 HTTP/2로 한 연결에서 여러 요청을 다중화
+- 429/5xx/연결 오류는 SDK 내장 재시도(지수 백오프 + 지터, Retry-After 준수)로 처리
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import openai
+
+# 한 이벤트 루프 안에서 동시에 진행할 수 있는 최대 OpenAI 호출 수 (RPM 한도 보호)
+MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+
+# 일시적 오류(429/408/409/5xx/연결 끊김) 재시도 횟수 (SDK 기본값 2회)
+MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "5"))
+
+_HTTP2 = importlib.util.find_spec("h2") is not None
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+_LOCK = threading.Lock()
+
+_SHARED_HTTPX: Optional[httpx.Client] = None
+_SYNC_CLIENTS: Dict[str, openai.OpenAI] = {}
+
+def get_client(api_key: str) -> openai.OpenAI:
+    """
+    공유 커넥션 풀을 쓰는 OpenAI 클라이언트 반환
+
+    Args:
+        api_key (str): OpenAI API 키
+
+    Returns:
+        openai.OpenAI: 키 단위로 재사용되는 동기 클라이언트
+    """
+    global _SHARED_HTTPX
+    with _LOCK:
+        client = _SYNC_CLIENTS.get(api_key)
+        if client is None:
+            if _SHARED_HTTPX is None:
+                _SHARED_HTTPX = httpx.Client(http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT)
+                atexit.register(_SHARED_HTTPX.close)
+            client = openai.OpenAI(api_key=api_key, http_client=_SHARED_HTTPX, max_retries=MAX_RETRIES)
+            _SYNC_CLIENTS[api_key] = client
+    return client
+
+def with_retries(client: openai.OpenAI) -> openai.OpenAI:
+    """
+    외부에서 주입된 클라이언트에 같은 재시도 정책 적용 (커넥션 풀은 그대로 공유)
+
+    Args:
+        client (openai.OpenAI): 주입된 클라이언트
+
+    Returns:
+        openai.OpenAI: max_retries 만 바꾼 복사본
+    """
+    return client.with_options(max_retries=MAX_RETRIES)
+
+# httpx.AsyncClient 커넥션 풀과 asyncio.Semaphore 는 생성된 루프에 묶이므로 루프별로 보관
+# 루프 -> (키별 AsyncOpenAI, 공유 httpx.AsyncClient, 세마포어)
+_LOOP_STATE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Tuple[Dict[str, Any], httpx.AsyncClient, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+def _loop_state() -> Tuple[Dict[str, Any], httpx.AsyncClient, asyncio.Semaphore]:
+    loop = asyncio.get_running_loop()
+    with _LOCK:
+        state = _LOOP_STATE.get(loop)
+        if state is None:
+            state = (
+                {},
+                httpx.AsyncClient(http2=_HTTP2, limits=_LIMITS, timeout=_TIMEOUT),
+                asyncio.Semaphore(MAX_CONCURRENCY),
+            )
+            _LOOP_STATE[loop] = state
+    return state
+
+def get_async_client(api_key: str) -> openai.AsyncOpenAI:
+    """
+    현재 이벤트 루프용 AsyncOpenAI 클라이언트 반환 (코루틴 안에서 호출)
+
+    Args:
+        api_key (str): OpenAI API 키
+
+    Returns:
+        openai.AsyncOpenAI: 루프/키 단위로 재사용되는 비동기 클라이언트
+    """
+    clients, http_client, _ = _loop_state()
+    client = clients.get(api_key)
+    if client is None:
+        client = openai.AsyncOpenAI(api_key=api_key, http_client=http_client, max_retries=MAX_RETRIES)
+        clients[api_key] = client
+    return client
+
+def get_semaphore() -> asyncio.Semaphore:
+    """현재 이벤트 루프의 OpenAI 동시 호출 제한 세마포어 반환"""
+    return _loop_state()[2]
@@ -1,66 +1,125 @@
 import os
+import re
+import glob
 import json
-from typing import List, Dict, Any, Set
+import time
+import sqlite3
+import threading
+from collections import Counter
+from typing import Iterable, Dict, Any, Set
+
+try:
+    import orjson  # 선택 의존성: 설치되어 있으면 더 빠른 직렬화 사용
+except ImportError:
+    orjson = None
+
+# bytes 를 str 로 디코드하지 않고 바로 파싱 (orjson.JSONDecodeError 는 json.JSONDecodeError 의 하위 클래스)
+_loads = orjson.loads if orjson is not None else json.loads
+
+_DIFFICULTIES = ("초급", "중급", "고급")
+
+# 사용자 ID 에서 제거할 문자 (str.isalnum() 이 참인 문자, '_', ' ' 이외의 모든 문자)
+_UNSAFE_CHARS = re.compile(r'[^\w ]')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT NOT NULL,
+    scenario_id TEXT NOT NULL,
+    completed_at INTEGER NOT NULL,
+    PRIMARY KEY (user_id, scenario_id)
+)
+"""
 
 class ProgressManager:
     """
     사용자별 학습 진행도를 관리하는 클래스.
+    모든 사용자의 진행도를 data/progress.sqlite 하나에 저장한다.
     """
     def __init__(self):
         self.data_dir = 'data'
         os.makedirs(self.data_dir, exist_ok=True)
+        self.db_path = os.path.join(self.data_dir, 'progress.sqlite')
+        # Streamlit 스크립트 스레드들이 연결 하나를 공유하므로 접근은 _lock 으로 직렬화한다
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._revisions: Dict[str, int] = {}
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+        self._migrate_json_files()
+
+    def _user_key(self, user_id: str) -> str:
+        """DB 에 저장할 사용자 키 (기존 progress_{사용자}.json 파일명과 같은 규칙)"""
+        safe_user_id = _UNSAFE_CHARS.sub('', user_id).rstrip()
+        return safe_user_id if safe_user_id else "default_user"
 
-    def _get_progress_file_path(self, user_id: str) -> str:
-        """사용자별 진행도 파일 경로를 반환합니다."""
-        safe_user_id = "".join(c for c in user_id if c.isalnum() or c in (' ', '_')).rstrip()
-        user_id = safe_user_id if safe_user_id else "default_user"
-        return os.path.join(self.data_dir, f'progress_{user_id}.json')
+    def _migrate_json_files(self):
+        """기존 사용자별 JSON 진행도 파일을 DB 로 옮기고 .migrated 로 이름을 바꿉니다."""
+        for file_path in glob.glob(os.path.join(self.data_dir, 'progress_*.json')):
+            user_key = os.path.basename(file_path)[len('progress_'):-len('.json')]
+            try:
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                completed_ids = _loads(content) if content else []
+                completed_at = int(os.path.getmtime(file_path))
+            except (json.JSONDecodeError, IOError):
+                continue
+            rows = [(user_key, str(scenario_id), completed_at) for scenario_id in completed_ids if scenario_id]
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._conn.executemany("INSERT OR IGNORE INTO progress VALUES (?, ?, ?)", rows)
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error:
+                    self._conn.execute("ROLLBACK")
+                    continue
+            os.replace(file_path, file_path + '.migrated')
 
     def load_completed_scenarios(self, user_id: str) -> Set[str]:
         """사용자가 완료한 시나리오 ID 목록을 불러옵니다."""
-        file_path = self._get_progress_file_path(user_id)
-        if not os.path.exists(file_path):
-            return set()
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                return set(json.loads(content)) if content else set()
-        except (json.JSONDecodeError, IOError):
-            return set()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT scenario_id FROM progress WHERE user_id = ?", (self._user_key(user_id),)
+            )
+            return {row[0] for row in rows}
 
-    def _save_completed_scenarios(self, user_id: str, completed_ids: Set[str]):
-        """완료한 시나리오 ID 목록을 파일에 저장합니다."""
-        file_path = self._get_progress_file_path(user_id)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(list(completed_ids), f, ensure_ascii=False, indent=4)
+    def get_revision(self, user_id: str) -> int:
+        """사용자 진행도가 바뀔 때마다 증가하는 번호 (통계 캐시 키로 사용)"""
+        return self._revisions.get(user_id, 0)
 
     def mark_scenario_completed(self, user_id: str, scenario_id: str):
         """특정 시나리오를 완료 상태로 기록합니다."""
         if not user_id or not scenario_id:
             return
-        completed_ids = self.load_completed_scenarios(user_id)
-        completed_ids.add(scenario_id)
-        self._save_completed_scenarios(user_id, completed_ids)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO progress VALUES (?, ?, ?)",
+                (self._user_key(user_id), scenario_id, int(time.time())),
+            )
+            if cursor.rowcount > 0:
+                self._revisions[user_id] = self._revisions.get(user_id, 0) + 1
 
-    def get_dashboard_stats(self, user_id: str, all_scenarios: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """대시보드에 표시할 통계 데이터를 계산합니다."""
+    def get_dashboard_stats(self, user_id: str, all_scenarios: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """대시보드에 표시할 통계 데이터를 계산합니다. (all_scenarios 는 한 번만 순회하므로 iterator 도 가능)"""
         completed_ids = self.load_completed_scenarios(user_id)
         
-        scenarios_with_id = [s for s in all_scenarios if s.get('id')]
-        total_count = len(scenarios_with_id)
-        
-        stats_by_difficulty = {"초급": {"total": 0, "completed": 0},
-                               "중급": {"total": 0, "completed": 0},
-                               "고급": {"total": 0, "completed": 0}}
-        
-        for scenario in scenarios_with_id:
+        # 목록을 따로 만들지 않고 한 번만 순회하며 난이도별 전체/완료 수를 센다
+        totals: Counter = Counter()
+        done: Counter = Counter()
+        total_count = 0
+        for scenario in all_scenarios:
+            scenario_id = scenario.get('id')
+            if not scenario_id:
+                continue
+            total_count += 1
             difficulty = scenario.get("difficulty", "중급")
-            if difficulty in stats_by_difficulty:
-                stats_by_difficulty[difficulty]["total"] += 1
-                if scenario['id'] in completed_ids:
-                    stats_by_difficulty[difficulty]["completed"] += 1
-
-        completed_count = sum(d['completed'] for d in stats_by_difficulty.values())
+            totals[difficulty] += 1
+            if scenario_id in completed_ids:
+                done[difficulty] += 1
+        
+        stats_by_difficulty = {d: {"total": totals[d], "completed": done[d]} for d in _DIFFICULTIES}
+        completed_count = sum(done[d] for d in _DIFFICULTIES)
 
         return {
             "total_count": total_count,
@@ -68,4 +127,3 @@ class ProgressManager:
             "completion_rate": (completed_count / total_count) if total_count > 0 else 0,
             "stats_by_difficulty": stats_by_difficulty,
         }
-